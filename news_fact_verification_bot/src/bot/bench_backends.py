@@ -0,0 +1,127 @@
+"""Recall / latency / memory comparison of vector backends against Chroma.
+
+Usage:
+    python -m bot.bench_backends --synthetic 200000 --dim 768 --queries 200
+    python -m bot.bench_backends --processed-dir data/processed --claims data/eval/claims_labeled.jsonl
+
+Ground truth is exact float32 cosine search; recall@k is measured for every backend
+configuration against it. `disk_mb` is the on-disk index size, `vec_mb` the bytes of
+the vector payload a query node has to page in.
+"""
+from __future__ import annotations
+import json
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from .vector_backends import NumpyBackend, write_numpy_index
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+def _synthetic(n: int, dim: int, n_queries: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(8, n // 500), dim)).astype(np.float32)
+    x = centers[rng.integers(0, len(centers), size=n)] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    q = x[rng.choice(n, size=n_queries, replace=False)] + 0.3 * rng.normal(size=(n_queries, dim)).astype(np.float32)
+    ids = [f"syn::{i}" for i in range(n)]
+    metas = [{"source": f"src{i % 20}", "published_at": f"2025-07-{1 + i % 28:02d}"} for i in range(n)]
+    return ids, [""] * n, metas, x, q
+
+def _corpus(processed_dir: Path, claims: Path | None, n_queries: int):
+    from .embed import load_chunks, load_encoder, chunk_metadata
+    model = load_encoder()
+    recs = list(load_chunks(processed_dir))
+    x = np.asarray(model.encode([r["text"] for r in recs]), dtype=np.float32)
+    texts = []
+    if claims:
+        with claims.open("r", encoding="utf-8") as f:
+            texts = [json.loads(line)["claim"] for line in f if line.strip()]
+    texts = texts[:n_queries] or [r["text"][:200] for r in recs[:n_queries]]
+    q = np.asarray(model.encode(texts), dtype=np.float32)
+    return [r["id"] for r in recs], [r["text"] for r in recs], [chunk_metadata(r) for r in recs], x, q
+
+def _exact(x, q, k):
+    xn = x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-12)
+    qn = q / (np.linalg.norm(q, axis=1, keepdims=True) + 1e-12)
+    return [set(np.argsort(-(xn @ v))[:k].tolist()) for v in qn]
+
+def _run(name, search, q, truth, ids_index, k):
+    lat, rec = [], []
+    for v, gt in zip(q, truth):
+        t0 = time.perf_counter()
+        got = search(v)
+        lat.append(time.perf_counter() - t0)
+        rec.append(len({ids_index[i] for i in got} & gt) / max(1, len(gt)))
+    lat.sort()
+    return {"backend": name, "recall_at_k": statistics.fmean(rec),
+            "p50_ms": 1000 * lat[len(lat) // 2], "p95_ms": 1000 * lat[min(len(lat) - 1, int(len(lat) * 0.95))]}
+
+def run_benchmark(ids, docs, metas, x, q, k: int = 8, nlist: int = 0, nprobe: int = 8, with_chroma: bool = True):
+    truth = _exact(x, q, k)
+    ids_index = {i: n for n, i in enumerate(ids)}
+    results = []
+    tmp = Path(tempfile.mkdtemp(prefix="bench_backends_"))
+    try:
+        configs = [("numpy-float16-exact", "float16", -1), ("numpy-int8-exact", "int8", -1)]
+        ivf_lists = nlist or max(16, int(4 * len(ids) ** 0.5))
+        if len(ids) >= 4 * ivf_lists:
+            configs.append((f"numpy-int8-ivf{ivf_lists}-p{nprobe}", "int8", ivf_lists))
+        for name, dtype, lists in configs:
+            d = tmp / name
+            t0 = time.perf_counter()
+            write_numpy_index(d, ids, docs, metas, x, dtype=dtype, nlist=max(0, lists), ivf_min_rows=len(ids) + 1)
+            build_s = time.perf_counter() - t0
+            be = NumpyBackend(index_dir=str(d), nprobe=nprobe)
+            r = _run(name, lambda v: be.query(embedding=v, n=k)["ids"][0], q, truth, ids_index, k)
+            r.update(build_s=build_s, disk_mb=_dir_size(d) / 2**20, vec_mb=be.vectors.nbytes / 2**20)
+            results.append(r)
+        if with_chroma:
+            import chromadb
+            d = tmp / "chroma"
+            client = chromadb.PersistentClient(path=str(d))
+            coll = client.get_or_create_collection("bench", metadata={"hnsw:space": "cosine"})
+            t0 = time.perf_counter()
+            step = 4096
+            for s in range(0, len(ids), step):
+                coll.add(ids=ids[s:s + step], documents=docs[s:s + step] if any(docs) else None,
+                         metadatas=metas[s:s + step], embeddings=x[s:s + step].tolist())
+            build_s = time.perf_counter() - t0
+            r = _run("chroma-hnsw", lambda v: coll.query(query_embeddings=[v.tolist()], n_results=k)["ids"][0],
+                     q, truth, ids_index, k)
+            r.update(build_s=build_s, disk_mb=_dir_size(d) / 2**20, vec_mb=x.nbytes / 2**20)
+            results.append(r)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--processed-dir", default=None, help="Benchmark on real chunks (requires embedding model)")
+    ap.add_argument("--claims", default=None, help="JSONL with `claim` fields used as queries")
+    ap.add_argument("--synthetic", type=int, default=0, help="Number of synthetic vectors instead of real chunks")
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--k", type=int, default=8)
+    ap.add_argument("--nlist", type=int, default=0)
+    ap.add_argument("--nprobe", type=int, default=8)
+    ap.add_argument("--no-chroma", action="store_true")
+    ap.add_argument("--out", default=None, help="Optional JSON output path")
+    args = ap.parse_args()
+    if args.synthetic:
+        data = _synthetic(args.synthetic, args.dim, args.queries)
+    elif args.processed_dir:
+        data = _corpus(Path(args.processed_dir), Path(args.claims) if args.claims else None, args.queries)
+    else:
+        raise SystemExit("Provide --synthetic N or --processed-dir")
+    res = run_benchmark(*data, k=args.k, nlist=args.nlist, nprobe=args.nprobe, with_chroma=not args.no_chroma)
+    print(f"{'backend':28} {'recall@k':>9} {'p50_ms':>8} {'p95_ms':>8} {'build_s':>8} {'disk_mb':>8} {'vec_mb':>8}")
+    for r in res:
+        print(f"{r['backend']:28} {r['recall_at_k']:9.3f} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} "
+              f"{r['build_s']:8.2f} {r['disk_mb']:8.1f} {r['vec_mb']:8.1f}")
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(res, indent=2))
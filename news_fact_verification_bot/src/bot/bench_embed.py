@@ -0,0 +1,82 @@
+"""Throughput and agreement of the ONNX embedding backend against PyTorch.
+
+Usage:
+    python -m bot.bench_embed --processed-dir data/processed --claims data/eval/claims_labeled.jsonl
+
+For each backend (torch, onnx fp32, onnx int8) reports texts/s, the mean / min cosine
+between its vectors and the torch vectors of the same texts, and retrieval agreement:
+overlap@k of claim -> chunk top-k lists with the torch top-k as reference.
+"""
+from __future__ import annotations
+import json
+import statistics
+import time
+from pathlib import Path
+import numpy as np
+from .config import settings
+
+def _normalise(x: np.ndarray) -> np.ndarray:
+    return x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-12)
+
+def _timed_encode(model, texts: list[str], batch_size: int):
+    model.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    t0 = time.perf_counter()
+    emb = np.asarray(model.encode(texts, batch_size=batch_size), dtype=np.float32)
+    return emb, time.perf_counter() - t0
+
+def run_benchmark(corpus: list[str], queries: list[str], k: int = 8, batch_size: int = 32):
+    from sentence_transformers import SentenceTransformer
+    from .onnx_embed import CONFIG_FILE, OnnxEncoder, export_onnx, model_dir
+    path = model_dir()
+    if not (path / CONFIG_FILE).exists():
+        export_onnx(settings.embed_model, path, quantize=True)
+    backends = [
+        ("torch", SentenceTransformer(settings.embed_model, device="cpu")),
+        ("onnx-fp32", OnnxEncoder(path, quantized=False)),
+        ("onnx-int8", OnnxEncoder(path, quantized=True)),
+    ]
+    ref_docs = ref_top = None
+    results = []
+    for name, model in backends:
+        docs, secs = _timed_encode(model, corpus, batch_size)
+        qs = _normalise(np.asarray(model.encode(queries, batch_size=batch_size), dtype=np.float32))
+        docs = _normalise(docs)
+        top = [set(np.argsort(-(docs @ q))[:k].tolist()) for q in qs]
+        if ref_docs is None:
+            ref_docs, ref_top = docs, top
+        cos = (docs * ref_docs).sum(axis=1)
+        results.append({
+            "backend": name,
+            "texts_per_s": len(corpus) / secs,
+            "cosine_mean": float(cos.mean()),
+            "cosine_min": float(cos.min()),
+            "overlap_at_k": statistics.fmean(len(a & b) / k for a, b in zip(top, ref_top)) if queries else None,
+        })
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    from .embed import load_chunks
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--processed-dir", default="data/processed")
+    ap.add_argument("--claims", default="data/eval/claims_labeled.jsonl")
+    ap.add_argument("--limit", type=int, default=2000, help="Max chunks to encode")
+    ap.add_argument("--k", type=int, default=8)
+    ap.add_argument("--batch-size", type=int, default=32)
+    ap.add_argument("--out", default=None, help="Optional JSON output path")
+    args = ap.parse_args()
+    corpus = [r["text"] for r in load_chunks(Path(args.processed_dir))][:args.limit]
+    queries = []
+    if Path(args.claims).exists():
+        with open(args.claims, "r", encoding="utf-8") as f:
+            queries = [json.loads(line)["claim"] for line in f if line.strip()]
+    if not corpus:
+        raise SystemExit(f"No chunks found in {args.processed_dir}")
+    res = run_benchmark(corpus, queries, k=min(args.k, len(corpus)), batch_size=args.batch_size)
+    print(f"{'backend':10} {'texts/s':>9} {'cos_mean':>9} {'cos_min':>9} {'overlap@k':>10}")
+    for r in res:
+        ov = f"{r['overlap_at_k']:10.3f}" if r["overlap_at_k"] is not None else f"{'-':>10}"
+        print(f"{r['backend']:10} {r['texts_per_s']:9.1f} {r['cosine_mean']:9.4f} {r['cosine_min']:9.4f} {ov}")
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(res, indent=2))
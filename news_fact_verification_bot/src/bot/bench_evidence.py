@@ -0,0 +1,80 @@
+"""Prompt size / latency of packed evidence vs the legacy 400-char-per-chunk prompt.
+
+Usage:
+    python -m bot.bench_evidence --claims data/eval/claims_labeled.jsonl --processed-dir data/processed --k 4,8,16
+    python -m bot.bench_evidence ... --llm            # also call the LLM: latency + verdict agreement
+
+Retrieval uses the BM25 baseline so the benchmark needs no vector index. Without
+`--llm` only prompt token counts (and packing time) are reported.
+"""
+from __future__ import annotations
+import json
+import statistics
+import time
+from pathlib import Path
+from .bm25_baseline import BM25Baseline
+from .config import settings
+from .evidence import count_tokens
+from .verdict import build_prompt, llm_verdict
+
+def run_benchmark(claims: list[str], bm25: BM25Baseline, ks: list[int], budget: int, use_llm: bool = False,
+                  model: str | None = None) -> list[dict]:
+    model = model or settings.model_name
+    rows = []
+    for k in ks:
+        legacy_toks, packed_toks, pack_ms = [], [], []
+        legacy_lat, packed_lat, agree = [], [], []
+        for claim in claims:
+            items = bm25.query(claim, k=k)
+            legacy_toks.append(count_tokens(build_prompt(claim, items, token_budget=0), model))
+            t0 = time.perf_counter()
+            packed = build_prompt(claim, items, token_budget=budget, model=model)
+            pack_ms.append(1000 * (time.perf_counter() - t0))
+            packed_toks.append(count_tokens(packed, model))
+            if use_llm:
+                stats = {"k": k, "filtered": 0, "latency_s": 0.0}
+                t0 = time.perf_counter()
+                v_old = llm_verdict(claim, items, stats, model=model, token_budget=0)
+                legacy_lat.append(time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                v_new = llm_verdict(claim, items, stats, model=model, token_budget=budget)
+                packed_lat.append(time.perf_counter() - t0)
+                agree.append(v_old.verdict == v_new.verdict)
+        row = {
+            "k": k,
+            "legacy_prompt_tokens": statistics.fmean(legacy_toks),
+            "packed_prompt_tokens": statistics.fmean(packed_toks),
+            "reduction": 1 - statistics.fmean(packed_toks) / statistics.fmean(legacy_toks),
+            "pack_ms": statistics.fmean(pack_ms),
+        }
+        if use_llm:
+            row.update(legacy_latency_s=statistics.median(legacy_lat), packed_latency_s=statistics.median(packed_lat),
+                       verdict_agreement=sum(agree) / len(agree))
+        rows.append(row)
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--claims", default="data/eval/claims_labeled.jsonl")
+    ap.add_argument("--processed-dir", default="data/processed")
+    ap.add_argument("--snapshot", default=None, help="Serve BM25 from an index snapshot instead")
+    ap.add_argument("--k", default="4,8,16", help="Comma-separated k values")
+    ap.add_argument("--budget", type=int, default=settings.evidence_token_budget or 600)
+    ap.add_argument("--llm", action="store_true", help="Also run llm_verdict with both prompts (needs API access)")
+    ap.add_argument("--out", default=None, help="Optional JSON output path")
+    args = ap.parse_args()
+    with open(args.claims, "r", encoding="utf-8") as f:
+        claims = [json.loads(line)["claim"] for line in f if line.strip()]
+    bm25 = BM25Baseline.from_snapshot(args.snapshot) if args.snapshot else BM25Baseline(args.processed_dir)
+    res = run_benchmark(claims, bm25, [int(k) for k in args.k.split(",")], args.budget, use_llm=args.llm)
+    for r in res:
+        line = (f"k={r['k']:<3} legacy={r['legacy_prompt_tokens']:7.1f} tok  packed={r['packed_prompt_tokens']:7.1f} tok  "
+                f"reduction={r['reduction']:.1%}  pack={r['pack_ms']:.2f}ms")
+        if args.llm:
+            line += (f"  latency {r['legacy_latency_s']:.2f}s -> {r['packed_latency_s']:.2f}s"
+                     f"  agreement={r['verdict_agreement']:.1%}")
+        print(line)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(res, indent=2))
@@ -0,0 +1,85 @@
+"""Write / read time and file size of Parquet batch results vs the JSONL format.
+
+Usage:
+    python -m bot.bench_results --claims 20000 --k 8 --pool 5000
+
+Synthesises `--claims` verdict records whose `--k` retrieved chunks are drawn from a
+pool of `--pool` chunk texts (so, as in real runs, chunks repeat across claims), then
+writes them with `--store-retrieved` semantics in both formats and times a full
+extended `evaluate` over each.
+"""
+from __future__ import annotations
+import json
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from .evaluation import evaluate
+from .results_store import ParquetResultsWriter, texts_path
+
+LABELS = ["SUPPORTED", "UNSUPPORTED", "NEEDS_MORE_EVIDENCE", "MIXED"]
+WORDS = ("central bank interest rates inflation vaccine approval regulator flooding province election "
+         "minister budget growth trade tariffs market stocks energy prices climate summit court ruling").split()
+
+def _synthetic(n_claims: int, k: int, pool: int, seed: int = 0):
+    rng = random.Random(seed)
+    chunks = [{"id": f"doc{i}::0", "title": f"Article {i}", "url": f"https://news.example/{i}",
+               "published_at": "2025-07-10", "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(120, 260)))}
+              for i in range(pool)]
+    for i in range(n_claims):
+        claim = f"claim {i}: " + " ".join(rng.choice(WORDS) for _ in range(10))
+        retrieved = rng.sample(chunks, k)
+        obj = {"claim": claim, "verdict": rng.choice(LABELS), "confidence": rng.random(), "rationale": "heuristic avg_overlap=0.2",
+               "cited_sources": [{"title": r["title"], "url": r["url"], "published_at": r["published_at"], "snippet": None} for r in retrieved],
+               "retrieval_stats": {"k": k, "filtered": 0, "latency_s": rng.random()}, "prompt_tokens": None,
+               "gold_label": rng.choice(LABELS)}
+        yield obj, retrieved
+
+def run_benchmark(n_claims: int, k: int, pool: int) -> list[dict]:
+    tmp = Path(tempfile.mkdtemp(prefix="bench_results_"))
+    try:
+        gold = tmp / "gold.jsonl"
+        with gold.open("w", encoding="utf-8") as wf:
+            for obj, _ in _synthetic(n_claims, k, pool):
+                wf.write(json.dumps({"claim": obj["claim"], "label": obj["gold_label"]}) + "\n")
+        rows = []
+        jsonl = tmp / "run.jsonl"
+        t0 = time.perf_counter()
+        with jsonl.open("w", encoding="utf-8") as wf:
+            for obj, retrieved in _synthetic(n_claims, k, pool):
+                wf.write(json.dumps({**obj, "retrieved": retrieved}, ensure_ascii=False) + "\n")
+        write_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        evaluate(jsonl, gold, tmp / "report_jsonl.json", extended=True)
+        rows.append({"format": "jsonl", "write_s": write_s, "evaluate_s": time.perf_counter() - t0,
+                     "size_mb": jsonl.stat().st_size / 2**20})
+        parquet = tmp / "run.parquet"
+        t0 = time.perf_counter()
+        with ParquetResultsWriter(parquet, store_texts=True) as pw:
+            for obj, retrieved in _synthetic(n_claims, k, pool):
+                pw.write(obj, retrieved)
+        write_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        evaluate(parquet, gold, tmp / "report_parquet.json", extended=True)
+        rows.append({"format": "parquet", "write_s": write_s, "evaluate_s": time.perf_counter() - t0,
+                     "size_mb": (parquet.stat().st_size + texts_path(parquet).stat().st_size) / 2**20})
+        return rows
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--claims", type=int, default=20000)
+    ap.add_argument("--k", type=int, default=8)
+    ap.add_argument("--pool", type=int, default=5000, help="Distinct chunk texts retrieved across all claims")
+    ap.add_argument("--out", default=None, help="Optional JSON output path")
+    args = ap.parse_args()
+    res = run_benchmark(args.claims, args.k, args.pool)
+    print(f"{'format':8} {'write_s':>8} {'evaluate_s':>11} {'size_mb':>8}")
+    for r in res:
+        print(f"{r['format']:8} {r['write_s']:8.2f} {r['evaluate_s']:11.2f} {r['size_mb']:8.1f}")
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(res, indent=2))
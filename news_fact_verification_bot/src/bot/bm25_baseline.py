@@ -7,10 +7,14 @@ import re
 
 TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
 
+META_KEYS = ("title", "url", "published_at", "source", "alt_sources", "alt_urls", "dup_count")
+
 class BM25Baseline:
-    def __init__(self, processed_dir: str):
+    def __init__(self, processed_dir: str | None = None):
         self.docs: List[str] = []
         self.metadatas: List[Dict] = []
+        if processed_dir is None:
+            return  # populated by an alternate constructor
         for p in Path(processed_dir).glob("*_chunks.jsonl"):
             with p.open("r", encoding="utf-8") as f:
                 for line in f:
@@ -18,10 +22,32 @@ class BM25Baseline:
                         continue
                     rec = json.loads(line)
                     self.docs.append(rec["text"])  # store doc text
-                    self.metadatas.append({k: rec.get(k) for k in ("title","url","published_at","source") if rec.get(k)})
+                    self.metadatas.append({k: rec.get(k) for k in META_KEYS if rec.get(k)})
+        self._index()
+
+    def _index(self):
         tokenized = [self._tokenize(d) for d in self.docs]
         self.bm25 = BM25Okapi(tokenized)
 
+    @classmethod
+    def from_records(cls, docs: List[str], metadatas: List[Dict]) -> "BM25Baseline":
+        obj = cls()
+        obj.docs = docs
+        obj.metadatas = [{k: m.get(k) for k in META_KEYS if m.get(k)} for m in metadatas]
+        obj._index()
+        return obj
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "BM25Baseline":
+        """Serve BM25 from a snapshot's prebuilt postings (memory-mapped, no re-parsing)."""
+        from .snapshot import Snapshot, SnapshotBM25
+        snap = snapshot if isinstance(snapshot, Snapshot) else Snapshot(snapshot)
+        obj = cls()
+        obj.docs = snap.documents  # lazy, decoded on access
+        obj.metadatas = snap.metadatas
+        obj.bm25 = SnapshotBM25(snap)
+        return obj
+
     def _tokenize(self, text: str):
         return [t.lower() for t in TOKEN_RE.findall(text)]
 
@@ -13,12 +13,23 @@ from .schemas import LabeledClaim
 @click.option('--out', type=click.Path(), default='results/output.jsonl')
 @click.option('--k', type=int, default=8)
 @click.option('--verdict-mode', type=click.Choice(['heuristic','llm']), default='heuristic')
-@click.option('--processed-dir', type=click.Path(exists=True), default='data/processed')
+@click.option('--processed-dir', type=click.Path(), default=None, help='Chunks for the BM25 baseline (default: data/processed; not needed with --snapshot).')
+@click.option('--snapshot', type=click.Path(exists=True), default=None, help='Serve the BM25 baseline from an index snapshot instead of --processed-dir.')
 @click.option('--baseline', is_flag=True, help='Use BM25 baseline instead of vector store (for comparison).')
 @click.option('--store-retrieved', is_flag=True, help='Include retrieved doc texts in batch output (enables extended metrics).')
-def main(claim: str | None, batch: str | None, out: str, k: int, verdict_mode: str, processed_dir: str, baseline: bool, store_retrieved: bool):
+@click.option('--out-format', type=click.Choice(['jsonl','parquet']), default=None, help='Batch output format (default: from --out suffix).')
+def main(claim: str | None, batch: str | None, out: str, k: int, verdict_mode: str, processed_dir: str, snapshot: str | None, baseline: bool, store_retrieved: bool, out_format: str | None):
     pipe = RAGPipeline(verdict_mode=verdict_mode)
-    bm25 = BM25Baseline(processed_dir) if baseline else None
+    bm25 = None
+    if baseline:
+        if snapshot:
+            bm25 = BM25Baseline.from_snapshot(snapshot)
+        else:
+            # only resolved here: snapshot-only workers have no processed chunks on disk
+            processed_dir = processed_dir or 'data/processed'
+            if not Path(processed_dir).exists():
+                raise click.BadParameter(f"Path '{processed_dir}' does not exist.", param_hint="'--processed-dir'")
+            bm25 = BM25Baseline(processed_dir)
     Path(out).parent.mkdir(parents=True, exist_ok=True)
 
     def simple_bm25_verdict_local(cl: str):
@@ -35,7 +46,13 @@ def main(claim: str | None, batch: str | None, out: str, k: int, verdict_mode: s
         print(json.dumps(v.model_dump(), ensure_ascii=False, indent=2))
 
     if batch:
-        with open(batch, 'r', encoding='utf-8') as f, open(out, 'w', encoding='utf-8') as wf:
+        fmt = out_format or ('parquet' if out.endswith('.parquet') else 'jsonl')
+        writer = None
+        if fmt == 'parquet':
+            # columnar: retrieved ids per claim, texts deduplicated into <out>.texts.parquet
+            from .results_store import ParquetResultsWriter
+            writer = ParquetResultsWriter(out, store_texts=store_retrieved)
+        with open(batch, 'r', encoding='utf-8') as f, (writer or open(out, 'w', encoding='utf-8')) as wf:
             for line in f:
                 if not line.strip():
                     continue
@@ -57,7 +74,10 @@ def main(claim: str | None, batch: str | None, out: str, k: int, verdict_mode: s
                     obj['retrieved'] = retrieved_items
                 if 'label' in rec:
                     obj['gold_label'] = rec['label']
-                wf.write(json.dumps(obj, ensure_ascii=False) + '\n')
+                if writer:
+                    writer.write(obj, retrieved_items)
+                else:
+                    wf.write(json.dumps(obj, ensure_ascii=False) + '\n')
 
     if not claim and not batch:
         raise click.UsageError('Provide --claim or --batch')
@@ -9,9 +9,20 @@ load_dotenv()
 class Settings:
     chroma_persist_dir: str = os.getenv("CHROMA_PERSIST_DIR", "./data/index")
     embed_model: str = os.getenv("EMBED_MODEL", "bge-base-en")
+    embed_backend: str = os.getenv("EMBED_BACKEND", "torch")  # torch|onnx
+    onnx_model_dir: str = os.getenv("ONNX_MODEL_DIR", "./data/onnx")
+    onnx_quantize: bool = os.getenv("ONNX_QUANTIZE", "1") == "1"  # int8 dynamic quantisation
     news_api_key: str | None = os.getenv("NEWS_API_KEY")
     llm_provider: str = os.getenv("LLM_PROVIDER", "openai")
     model_name: str = os.getenv("MODEL_NAME", "gpt-4o-mini")
     top_k: int = int(os.getenv("TOP_K", "8"))
+    evidence_token_budget: int = int(os.getenv("EVIDENCE_TOKEN_BUDGET", "600"))  # 0 = legacy 400-char chunks
+    vector_backend: str = os.getenv("VECTOR_BACKEND", "chroma")  # chroma|numpy|snapshot
+    snapshot_path: str = os.getenv("SNAPSHOT_PATH", "./data/snapshots/index.nfsnap")
+    numpy_index_dir: str = os.getenv("NUMPY_INDEX_DIR", "./data/index_np")
+    numpy_dtype: str = os.getenv("NUMPY_DTYPE", "int8")  # int8|float16
+    ivf_nlist: int = int(os.getenv("IVF_NLIST", "0"))  # 0 = exact for small corpora, auto IVF for large
+    ivf_nprobe: int = int(os.getenv("IVF_NPROBE", "8"))
+    shard_period: str = os.getenv("SHARD_PERIOD", "")  # ""|week|month
 
 settings = Settings()
@@ -2,8 +2,10 @@ from __future__ import annotations
 import json, os, re
 from pathlib import Path
 from typing import Iterable
+import numpy as np
 import orjson
 from tqdm import tqdm
+from .dedup import MinHashDeduper, dedupe_chunks, merge_copy
 
 NEWLINE_RE = re.compile(r"\s+")
 
@@ -40,21 +42,101 @@ def chunk_text(text: str, max_tokens: int = 350) -> list[str]:
         chunks.append(" ".join(cur))
     return chunks
 
-def process_file(in_path: Path, out_dir: Path):
+def iter_chunk_records(in_path: Path) -> Iterable[dict]:
+    base = in_path.stem
+    for rec in tqdm(load_jsonl(in_path), desc=f"ingest:{in_path.name}"):
+        body = clean_text(rec.get("content") or rec.get("text") or "")
+        meta = {k: rec.get(k) for k in ("title", "url", "published_at", "source") if rec.get(k)}
+        for i, chunk in enumerate(chunk_text(body)):
+            yield {"id": f"{rec.get('id', base)}::{i}", "text": chunk, **meta}
+
+def _write_chunks(path: Path, records: Iterable[dict]):
+    with path.open("w", encoding="utf-8") as wf:
+        for rec in records:
+            wf.write(orjson.dumps(rec).decode() + "\n")
+
+def signatures_path(chunks_path: Path) -> Path:
+    """MinHash signatures of a chunks file's records, in file order (uint32, one row each)."""
+    return chunks_path.with_name(chunks_path.stem + ".minhash.npy")
+
+def _load_signatures(chunks_path: Path, records: list[dict], deduper: MinHashDeduper) -> list[tuple]:
+    # earlier chunks are signed once and reused by every later ingest
+    path = signatures_path(chunks_path)
+    if path.exists():
+        sigs = np.load(path)
+        if sigs.shape == (len(records), deduper.num_perm):
+            return [tuple(row) for row in sigs.tolist()]
+    sigs = [deduper.signature(rec.get("text", "")) for rec in records]
+    _save_signatures(chunks_path, sigs, deduper)
+    return sigs
+
+def _save_signatures(chunks_path: Path, sigs: list[tuple], deduper: MinHashDeduper):
+    np.save(signatures_path(chunks_path), np.asarray(sigs, dtype=np.uint32).reshape(len(sigs), deduper.num_perm))
+
+def _carry_alternates(records: Iterable[dict], previous: dict[str, dict]) -> Iterable[dict]:
+    for rec in records:
+        if rec["id"] in previous:
+            merge_copy(rec, previous[rec["id"]])
+        yield rec
+
+def process_file(in_path: Path, out_dir: Path, dedup: bool = True, dedup_threshold: float = 0.8,
+                 dedup_across: bool = True) -> dict:
+    """Chunk one raw file into `<out_dir>/<stem>_chunks.jsonl`.
+
+    With `dedup_across`, chunks already written to `out_dir` by earlier ingests seed the
+    deduplicator: later copies of a wire story are dropped and recorded on the earlier
+    canonical chunk, whose file is rewritten. Re-ingesting a file keeps the copies its
+    chunks had already absorbed.
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
     base = in_path.stem
     out_path = out_dir / f"{base}_chunks.jsonl"
-    with out_path.open("w", encoding="utf-8") as wf:
-        for rec in tqdm(load_jsonl(in_path), desc=f"ingest:{in_path.name}"):
-            body = clean_text(rec.get("content") or rec.get("text") or "")
-            meta = {k: rec.get(k) for k in ("title", "url", "published_at", "source") if rec.get(k)}
-            for i, chunk in enumerate(chunk_text(body)):
-                wf.write(orjson.dumps({"id": f"{rec.get('id', base)}::{i}", "text": chunk, **meta}).decode() + "\n")
+    records: Iterable[dict] = iter_chunk_records(in_path)
+    stats: dict = {}
+    if dedup:
+        if out_path.exists():
+            previous = {rec["id"]: rec for rec in load_jsonl(out_path)}
+            records = _carry_alternates(records, previous)
+        deduper = MinHashDeduper(threshold=dedup_threshold)
+        existing: list[dict] = []
+        existing_sigs: list[tuple] = []
+        owners: list[Path] = []
+        if dedup_across:
+            for path in sorted(out_dir.glob("*_chunks.jsonl")):
+                if path == out_path:
+                    continue  # re-ingesting the same file replaces its output
+                recs = list(load_jsonl(path))
+                existing.extend(recs)
+                existing_sigs.extend(_load_signatures(path, recs, deduper))
+                owners.extend([path] * len(recs))
+        # collapse syndicated copies before they reach embedding / the index
+        records, stats = dedupe_chunks(records, existing=existing, existing_signatures=existing_sigs, deduper=deduper)
+        touched = sorted({owners[i] for i in stats["updated_existing"]})
+        for path in touched:
+            # records keep their order, so the persisted signatures stay valid
+            _write_chunks(path, (rec for rec, owner in zip(existing, owners) if owner == path))
+        stats["files_updated"] = [str(p) for p in touched]
+        _save_signatures(out_path, stats.pop("signatures"), deduper)
+    else:
+        signatures_path(out_path).unlink(missing_ok=True)
+    _write_chunks(out_path, records)
+    return stats
 
 if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True, help="Path to raw JSONL file")
     ap.add_argument("--out-dir", required=True)
+    ap.add_argument("--no-dedup", action="store_true", help="Disable near-duplicate chunk collapsing")
+    ap.add_argument("--dedup-threshold", type=float, default=0.8, help="Estimated Jaccard similarity to treat chunks as duplicates")
+    ap.add_argument("--no-dedup-across", action="store_true",
+                    help="Only deduplicate within --input, not against chunks already in --out-dir")
     args = ap.parse_args()
-    process_file(Path(args.input), Path(args.out_dir))
+    stats = process_file(Path(args.input), Path(args.out_dir), dedup=not args.no_dedup,
+                         dedup_threshold=args.dedup_threshold, dedup_across=not args.no_dedup_across)
+    if stats:
+        print(f"[dedup] chunks {stats['chunks_in']} -> {stats['chunks_out']} "
+              f"(removed {stats['removed']}, {stats['reduction']:.1%} reduction)")
+        if stats["files_updated"]:
+            print(f"[dedup] merged copies into {len(stats['updated_existing'])} earlier chunks "
+                  f"({len(stats['files_updated'])} files rewritten)")
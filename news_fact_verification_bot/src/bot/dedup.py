@@ -0,0 +1,151 @@
+"""Near-duplicate chunk detection (MinHash + LSH banding) used at ingest time.
+
+Syndicated wire stories show up many times under different URLs. Each chunk is
+reduced to a MinHash signature over word shingles; signatures are split into
+bands and bucketed so that only chunks sharing at least one band are compared.
+Cost is linear in the number of chunks (plus a small number of candidate checks).
+Duplicates collapse into the first-seen (canonical) chunk, which keeps the
+alternative sources / URLs in its metadata.
+"""
+from __future__ import annotations
+import re
+import zlib
+from typing import Dict, Iterable, List, Tuple
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def _shingles(text: str, size: int) -> set[int]:
+    toks = [t.lower() for t in TOKEN_RE.findall(text)]
+    if len(toks) < size:
+        return {zlib.crc32(" ".join(toks).encode())} if toks else set()
+    return {zlib.crc32(" ".join(toks[i:i + size]).encode()) for i in range(len(toks) - size + 1)}
+
+class MinHashDeduper:
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 5, threshold: float = 0.8, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        # deterministic universal hash parameters (a*x + b) mod p
+        state = seed
+        self._perms: List[Tuple[int, int]] = []
+        for _ in range(num_perm):
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = (state >> 3) % (_MERSENNE_PRIME - 1) + 1
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            b = (state >> 3) % _MERSENNE_PRIME
+            self._perms.append((a, b))
+        self._buckets: List[Dict[tuple, List[int]]] = [{} for _ in range(bands)]
+        self._signatures: List[tuple] = []
+
+    def signature(self, text: str) -> tuple:
+        sh = _shingles(text, self.shingle_size)
+        if not sh:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(min(((a * x + b) % _MERSENNE_PRIME) & _MAX_HASH for x in sh) for a, b in self._perms)
+
+    @staticmethod
+    def similarity(sig_a: tuple, sig_b: tuple) -> float:
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+    def find_or_add(self, text: str, sig: tuple | None = None) -> int | None:
+        """Return the index of an already seen near-duplicate, or register text and return None.
+
+        `sig` skips re-signing when the signature is already known (e.g. persisted).
+        """
+        sig = self.signature(text) if sig is None else sig
+        keys = [sig[b * self.rows:(b + 1) * self.rows] for b in range(self.bands)]
+        checked: set[int] = set()
+        for b, key in enumerate(keys):
+            for idx in self._buckets[b].get(key, ()):
+                if idx in checked:
+                    continue
+                checked.add(idx)
+                if self.similarity(sig, self._signatures[idx]) >= self.threshold:
+                    return idx
+        idx = len(self._signatures)
+        self._signatures.append(sig)
+        for b, key in enumerate(keys):
+            self._buckets[b].setdefault(key, []).append(idx)
+        return None
+
+ALT_FIELDS = (("source", "alt_sources"), ("url", "alt_urls"))
+
+def merge_copy(canon: dict, rec: dict) -> bool:
+    """Record `rec` (and the copies it already absorbed) on `canon`; idempotent.
+
+    Copies are counted by distinct chunk id, so re-ingesting a file does not inflate
+    `dup_count`. Returns whether `canon` changed.
+    """
+    changed = False
+    for cid in [rec.get("id"), *rec.get("dup_ids", [])]:
+        if cid and cid != canon.get("id") and cid not in canon.get("dup_ids", []):
+            canon.setdefault("dup_ids", []).append(cid)
+            changed = True
+    for field, alt in ALT_FIELDS:
+        for val in [rec.get(field), *rec.get(alt, [])]:
+            if val and val != canon.get(field) and val not in canon.get(alt, []):
+                canon.setdefault(alt, []).append(val)
+                changed = True
+    if canon.get("dup_ids"):
+        canon["dup_count"] = len(canon["dup_ids"])
+    return changed
+
+def dedupe_chunks(records: Iterable[dict], threshold: float = 0.8, existing: List[dict] | None = None,
+                  existing_signatures: List[tuple] | None = None, deduper: MinHashDeduper | None = None,
+                  **kwargs) -> tuple[list[dict], dict]:
+    """Collapse near-duplicate chunk records.
+
+    The canonical record gains `alt_sources` / `alt_urls` (lists, excluding its own),
+    `dup_ids` and `dup_count` (distinct copies). `existing` records (chunks kept by earlier
+    ingests) are registered first, using `existing_signatures` when given instead of
+    re-signing them; new copies of them are dropped and merged into those records in
+    place, and their positions are reported in `stats["updated_existing"]`. The
+    signatures of the returned records are in `stats["signatures"]`.
+    Returns (new_canonical_records, stats).
+    """
+    deduper = deduper or MinHashDeduper(threshold=threshold, **kwargs)
+    existing = existing or []
+    # signature index -> (is_existing, position); existing records that already duplicate
+    # each other register no signature of their own
+    owners: list[tuple[bool, int]] = []
+    for pos, rec in enumerate(existing):
+        sig = existing_signatures[pos] if existing_signatures is not None else None
+        if deduper.find_or_add(rec.get("text", ""), sig=sig) is None:
+            owners.append((True, pos))
+    kept: list[dict] = []
+    kept_sigs: list[tuple] = []
+    updated: set[int] = set()
+    n_in = 0
+    for rec in records:
+        n_in += 1
+        sig = deduper.signature(rec.get("text", ""))
+        idx = deduper.find_or_add(rec.get("text", ""), sig=sig)
+        if idx is None:
+            owners.append((False, len(kept)))
+            kept.append(dict(rec))
+            kept_sigs.append(sig)
+            continue
+        is_existing, pos = owners[idx]
+        if is_existing:
+            if merge_copy(existing[pos], rec):
+                updated.add(pos)
+        else:
+            merge_copy(kept[pos], rec)
+    removed = n_in - len(kept)
+    stats = {
+        "chunks_in": n_in,
+        "chunks_out": len(kept),
+        "removed": removed,
+        "reduction": (removed / n_in) if n_in else 0.0,
+        "updated_existing": sorted(updated),
+        "signatures": kept_sigs,
+    }
+    return kept, stats
+
+__all__ = ["MinHashDeduper", "dedupe_chunks", "merge_copy"]
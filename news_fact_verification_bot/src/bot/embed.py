@@ -1,25 +1,46 @@
 from __future__ import annotations
 from pathlib import Path
 import time
-from sentence_transformers import SentenceTransformer
-import chromadb
-from chromadb.config import Settings as ChromaSettings
+from functools import lru_cache
 from .config import settings
+from .vector_store import VectorStore
 import orjson
 from tqdm import tqdm
 
 EMBED_CACHE_FILE = Path("data/cache/embed_cache.orjson")
 
+@lru_cache(maxsize=2)
+def load_encoder(backend: str | None = None):
+    """Model used both for indexing and for query encoding (EMBED_BACKEND=torch|onnx)."""
+    backend = backend or settings.embed_backend
+    if backend == "onnx":
+        from .onnx_embed import load_onnx_encoder
+        return load_onnx_encoder()
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(settings.embed_model)
+
 # Simple embedding cache to speed iterative runs
 
-def load_cache():
-    if EMBED_CACHE_FILE.exists():
-        return {rec["text"]: rec["embedding"] for rec in orjson.loads(EMBED_CACHE_FILE.read_bytes())}
+def cache_file(model=None) -> Path:
+    # onnx (and its int8 variant) vectors differ slightly from torch ones; keep caches apart.
+    # Named after the model file actually loaded: OnnxEncoder falls back to fp32 when no
+    # int8 copy was exported, whatever ONNX_QUANTIZE says.
+    model_file = getattr(model, "model_file", None)
+    if model_file:
+        from .onnx_embed import INT8_FILE
+        return EMBED_CACHE_FILE.with_name(f"embed_cache.onnx{'-int8' if model_file == INT8_FILE else ''}.orjson")
+    return EMBED_CACHE_FILE
+
+def load_cache(model=None):
+    path = cache_file(model)
+    if path.exists():
+        return {rec["text"]: rec["embedding"] for rec in orjson.loads(path.read_bytes())}
     return {}
 
-def save_cache(cache: dict[str, list[float]]):
-    EMBED_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    EMBED_CACHE_FILE.write_bytes(orjson.dumps([{"text": t, "embedding": v} for t, v in cache.items()]))
+def save_cache(cache: dict[str, list[float]], model=None):
+    path = cache_file(model)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps([{"text": t, "embedding": v} for t, v in cache.items()]))
 
 def load_chunks(processed_dir: Path):
     for p in processed_dir.glob("*_chunks.jsonl"):
@@ -28,11 +49,20 @@ def load_chunks(processed_dir: Path):
                 if line.strip():
                     yield orjson.loads(line)
 
-def build_vector_store(input_dir: Path, persist_dir: Path):
-    model = SentenceTransformer(settings.embed_model)
-    client = chromadb.PersistentClient(path=str(persist_dir), settings=ChromaSettings(allow_reset=True))
-    coll = client.get_or_create_collection("news_chunks")
-    cache = load_cache()
+def chunk_metadata(rec: dict) -> dict:
+    md = {k: rec.get(k) for k in ("title", "url", "published_at", "source") if rec.get(k)}
+    # chroma metadata values must be scalars; flatten the dedup alternatives
+    for k in ("alt_sources", "alt_urls"):
+        if rec.get(k):
+            md[k] = "|".join(rec[k])
+    if rec.get("dup_count"):
+        md["dup_count"] = int(rec["dup_count"])
+    return md
+
+def build_vector_store(input_dir: Path, persist_dir: Path, backend: str | None = None, shard_period: str | None = None):
+    model = load_encoder()
+    store = VectorStore(str(persist_dir), backend=backend, shard_period=shard_period)
+    cache = load_cache(model)
     new_cache = False
     batch_texts, batch_ids, metadatas = [], [], []
     for rec in tqdm(load_chunks(input_dir), desc="embed"):
@@ -45,22 +75,24 @@ def build_vector_store(input_dir: Path, persist_dir: Path):
             new_cache = True
         batch_ids.append(rec["id"])
         batch_texts.append(text)
-        md = {k: rec.get(k) for k in ("title", "url", "published_at", "source") if rec.get(k)}
-        metadatas.append(md)
+        metadatas.append(chunk_metadata(rec))
         if len(batch_ids) >= 64:
-            coll.add(ids=batch_ids, documents=batch_texts, metadatas=metadatas, embeddings=[cache[t] for t in batch_texts])
+            store.add(ids=batch_ids, documents=batch_texts, metadatas=metadatas, embeddings=[cache[t] for t in batch_texts])
             batch_texts, batch_ids, metadatas = [], [], []
     if batch_ids:
-        coll.add(ids=batch_ids, documents=batch_texts, metadatas=metadatas, embeddings=[cache[t] for t in batch_texts])
+        store.add(ids=batch_ids, documents=batch_texts, metadatas=metadatas, embeddings=[cache[t] for t in batch_texts])
+    store.persist()
     if new_cache:
-        save_cache(cache)
+        save_cache(cache, model)
 
 if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True)
     ap.add_argument("--persist-dir", required=True)
+    ap.add_argument("--backend", choices=["chroma", "numpy"], default=None, help="Vector backend (default: VECTOR_BACKEND)")
+    ap.add_argument("--shard-by", choices=["week", "month"], default=None, help="Partition into time shards (default: SHARD_PERIOD)")
     args = ap.parse_args()
     t0 = time.time()
-    build_vector_store(Path(args.input), Path(args.persist_dir))
+    build_vector_store(Path(args.input), Path(args.persist_dir), backend=args.backend, shard_period=args.shard_by)
     print(f"Done in {time.time()-t0:.2f}s")
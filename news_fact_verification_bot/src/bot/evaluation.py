@@ -84,21 +84,15 @@ def load_jsonl(path: Path):
             if line.strip():
                 yield json.loads(line)
 
-def evaluate(pred_path: Path, gold_path: Path, out_path: Path, extended: bool = False):
-    gold = {rec['claim']: rec['label'] for rec in load_jsonl(gold_path)}
-    y_pred, y_gold = [], []
-    labels = set(gold.values())
-    pred_records = list(load_jsonl(pred_path))
-    for rec in pred_records:
-        claim = rec['claim']
-        if claim in gold:
-            y_pred.append(rec['verdict'])
-            y_gold.append(gold[claim])
+def _label_report(y_pred: List[str], y_gold: List[str], labels: set) -> dict:
     correct = sum(1 for p, g in zip(y_pred, y_gold) if p == g)
     acc = correct / len(y_gold) if y_gold else 0.0
     conf: dict[str, dict[str, int]] = {g: {p:0 for p in labels} for g in labels}
     for p,g in zip(y_pred,y_gold):
         conf[g][p] = conf[g].get(p,0)+1
+    return _report_from_confusion(conf, labels, acc, len(y_gold))
+
+def _report_from_confusion(conf: dict, labels: set, acc: float, n: int) -> dict:
     metrics = {}
     for lbl in labels:
         tp = conf[lbl].get(lbl,0)
@@ -108,9 +102,97 @@ def evaluate(pred_path: Path, gold_path: Path, out_path: Path, extended: bool =
         rec_v = tp / (tp+fn) if (tp+fn)>0 else 0.0
         f1 = 2*prec*rec_v/(prec+rec_v) if (prec+rec_v)>0 else 0.0
         metrics[lbl] = {"precision": prec, "recall": rec_v, "f1": f1, "support": sum(conf[lbl].values())}
-    report = {"accuracy": acc, "n": len(y_gold), "per_label": metrics, "confusion": conf}
-    if extended:
-        report["extended"] = compute_extended_metrics(pred_records, gold)
+    return {"accuracy": acc, "n": n, "per_label": metrics, "confusion": conf}
+
+def evaluate_columnar(pred_path: Path, gold: Dict[str, str], extended: bool = False) -> dict:
+    """Metrics straight from a Parquet results file (see bot.results_store) with column ops."""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from .results_store import read_results, read_texts
+    cols = ["claim", "verdict", "latency_s"] + (["retrieved_ids"] if extended else [])
+    tbl = read_results(pred_path, columns=cols)
+    labels = set(gold.values())
+    gold_claims = pa.array(list(gold.keys()), pa.string())
+    gold_labels = pa.array(list(gold.values()), pa.string())
+    idx = pc.index_in(tbl["claim"], value_set=gold_claims)
+    matched = pc.is_valid(idx)
+    y_pred = pc.filter(tbl["verdict"], matched)
+    y_gold = pc.take(gold_labels, pc.filter(idx, matched))
+    n = len(y_gold)
+    acc = (pc.sum(pc.cast(pc.equal(y_pred, y_gold), pa.int64())).as_py() or 0) / n if n else 0.0
+    conf: dict[str, dict[str, int]] = {g: {p:0 for p in labels} for g in labels}
+    pairs = pa.table({"g": y_gold, "p": y_pred}).group_by(["g", "p"]).aggregate([("p", "count")])
+    for g, p, c in zip(pairs["g"].to_pylist(), pairs["p"].to_pylist(), pairs["p_count"].to_pylist()):
+        conf[g][p] = conf[g].get(p, 0) + c
+    report = _report_from_confusion(conf, labels, acc, n)
+    if not extended:
+        return report
+    # extended proxies: same definitions as compute_extended_metrics
+    verdicts = tbl["verdict"]
+    rec_gold = pc.take(gold_labels, idx)  # null where claim not in gold
+    is_unsup = pc.fill_null(pc.equal(rec_gold, "UNSUPPORTED"), False)
+    unsupported_total = pc.sum(pc.cast(is_unsup, pa.int64())).as_py() or 0
+    fp_count = pc.sum(pc.cast(pc.and_(is_unsup, pc.fill_null(pc.equal(verdicts, "SUPPORTED"), False)), pa.int64())).as_py() or 0
+    lat = pc.drop_null(tbl["latency_s"]).to_numpy()
+    ext = {"context_precision": None, "answer_relevancy": None, "faithfulness": None,
+           "false_positive_rate": (fp_count / unsupported_total) if unsupported_total else None,
+           "median_latency_s": float(np.median(lat)) if len(lat) else None,
+           "n_latency": int(len(lat)), "records_used": 0}
+    texts = read_texts(pred_path)
+    if texts is not None and tbl.num_rows:
+        ids = tbl["retrieved_ids"].combine_chunks()
+        flat_ids = pc.list_flatten(ids)
+        parents = pc.list_parent_indices(ids).to_numpy()
+        # tokenise every distinct chunk once, however many claims retrieved it
+        text_tokens = [set(_tokenize(t or "")) for t in texts["text"].to_pylist()]
+        pos_arr = pc.index_in(flat_ids, value_set=texts["id"])
+        has_text = pc.is_valid(pos_arr).to_numpy(zero_copy_only=False)
+        pos = pc.fill_null(pos_arr, 0).to_numpy()
+        claims = tbl["claim"].to_pylist()
+        claim_tokens = [set(_tokenize(c or "")) for c in claims]
+        ov = np.zeros(len(pos))
+        for j in np.nonzero(has_text)[0]:
+            ct = claim_tokens[parents[j]]
+            if ct:
+                ov[j] = len(ct & text_tokens[int(pos[j])]) / (len(ct) + 1e-9)
+        parents, ov = parents[has_text], ov[has_text]
+        n_rec = tbl.num_rows
+        k = np.bincount(parents, minlength=n_rec)
+        relevant = np.bincount(parents, weights=(ov >= 0.20), minlength=n_rec)
+        best = np.zeros(n_rec)
+        np.maximum.at(best, parents, ov)
+        used = k > 0
+        if used.any():
+            supp = np.isin(np.asarray(verdicts.to_pylist(), dtype=object), ["SUPPORTED", "MIXED"]) & used
+            ext.update(context_precision=float((relevant[used] / k[used]).mean()),
+                       answer_relevancy=float(best[used].mean()),
+                       faithfulness=float((relevant[supp] > 0).mean()) if supp.any() else None,
+                       records_used=int(used.sum()))
+    report["extended"] = ext
+    return report
+
+def _is_parquet(path: Path) -> bool:
+    # sniff the magic bytes: `cli --out-format` can write parquet under any suffix
+    with open(path, 'rb') as f:
+        return f.read(4) == b'PAR1'
+
+def evaluate(pred_path: Path, gold_path: Path, out_path: Path, extended: bool = False):
+    gold = {rec['claim']: rec['label'] for rec in load_jsonl(gold_path)}
+    if _is_parquet(Path(pred_path)):
+        report = evaluate_columnar(Path(pred_path), gold, extended=extended)
+    else:
+        y_pred, y_gold = [], []
+        labels = set(gold.values())
+        pred_records = list(load_jsonl(pred_path))
+        for rec in pred_records:
+            claim = rec['claim']
+            if claim in gold:
+                y_pred.append(rec['verdict'])
+                y_gold.append(gold[claim])
+        report = _label_report(y_pred, y_gold, labels)
+        if extended:
+            report["extended"] = compute_extended_metrics(pred_records, gold)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(json.dumps(report, indent=2))
     return report
@@ -118,7 +200,7 @@ def evaluate(pred_path: Path, gold_path: Path, out_path: Path, extended: bool =
 if __name__ == '__main__':
     import argparse
     ap = argparse.ArgumentParser()
-    ap.add_argument('--pred', required=True)
+    ap.add_argument('--pred', required=True, help='Batch results (JSONL or Parquet, detected from content)')
     ap.add_argument('--gold', required=True)
     ap.add_argument('--report', required=True)
     ap.add_argument('--extended', action='store_true', help='Compute extended proxy RAG metrics')
@@ -0,0 +1,95 @@
+"""Evidence packing for LLM verdict prompts.
+
+Instead of sending the first 400 characters of every retrieved chunk, sentences from
+all chunks are scored against the claim, near-duplicate sentences are dropped and the
+best ones are packed into a token budget. Kept sentences stay grouped under their
+chunk index (`[i] title :: ...`) so the model can still cite chunks by position.
+"""
+from __future__ import annotations
+import re
+from typing import List
+try:
+    import tiktoken  # type: ignore
+except Exception:  # pragma: no cover
+    tiktoken = None  # type: ignore
+
+SENT_RE = re.compile(r"(?<=[.!?])\s+")
+TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
+STOPWORDS = {
+    "the", "and", "for", "that", "with", "this", "from", "was", "were", "are", "has", "have",
+    "had", "its", "their", "but", "not", "been", "will", "would", "into", "than", "then", "they",
+    "said", "also", "which", "who", "about", "after", "over", "more", "there",
+}
+
+def _terms(text: str) -> set[str]:
+    return {t for t in (w.lower() for w in TOKEN_RE.findall(text)) if len(t) > 2 and t not in STOPWORDS}
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    """Exact count with tiktoken when installed, else the ingest chunker's words/0.75 estimate."""
+    if tiktoken is not None:
+        try:
+            enc = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("cl100k_base")
+        except KeyError:
+            enc = tiktoken.get_encoding("cl100k_base")
+        return len(enc.encode(text))
+    return max(1, int(len(text.split()) / 0.75))
+
+def legacy_evidence(retrieved: List[dict]) -> str:
+    """Original prompt evidence: every chunk cut to 400 characters."""
+    return "\n".join(f"[{i}] {r.get('title','')} :: {r['text'][:400]}" for i, r in enumerate(retrieved))
+
+def _header(ci: int, r: dict) -> str:
+    return f"[{ci}] {r.get('title','')} ::"
+
+def _render(by_chunk: dict[int, list[tuple[int, str]]], retrieved: List[dict]) -> str:
+    return "\n".join(f"{_header(ci, retrieved[ci])} " + " ".join(s for _, s in sorted(by_chunk[ci]))
+                     for ci in sorted(by_chunk))
+
+def pack_evidence(claim: str, retrieved: List[dict], token_budget: int = 600, redundancy: float = 0.6,
+                  model: str | None = None) -> tuple[str, dict]:
+    """Select claim-relevant, non-redundant sentences across chunks within `token_budget`.
+
+    The budget covers the whole rendered evidence, including each cited chunk's
+    `[i] title ::` header.
+    """
+    claim_terms = _terms(claim)
+    candidates = []  # (score, chunk_idx, sent_pos, sentence, terms)
+    n_sentences = 0
+    for ci, r in enumerate(retrieved):
+        for si, sent in enumerate(s.strip() for s in SENT_RE.split(r.get("text", ""))):
+            if not sent:
+                continue
+            n_sentences += 1
+            terms = _terms(sent)
+            coverage = len(claim_terms & terms) / (len(claim_terms) + 1e-9)
+            # small tie-break toward higher-ranked chunks
+            candidates.append((coverage + 0.01 / (1 + ci), ci, si, sent, terms))
+    candidates.sort(key=lambda c: c[0], reverse=True)
+    by_chunk: dict[int, list[tuple[int, str]]] = {}
+    kept_terms: list[set[str]] = []
+    used = 0
+    for score, ci, si, sent, terms in candidates:
+        if kept_terms and score < 0.02:
+            break  # remaining sentences share nothing with the claim
+        if any(len(terms & t) / (len(terms | t) or 1) >= redundancy for t in kept_terms):
+            continue
+        cost = count_tokens(sent, model)
+        if ci not in by_chunk:
+            cost += count_tokens(_header(ci, retrieved[ci]), model)  # first sentence of this chunk
+        if used + cost > token_budget:
+            continue
+        # per-piece counts are not exactly additive (token merges, newlines); check the real text
+        by_chunk.setdefault(ci, []).append((si, sent))
+        total = count_tokens(_render(by_chunk, retrieved), model)
+        if total > token_budget:
+            by_chunk[ci].pop()
+            if not by_chunk[ci]:
+                del by_chunk[ci]
+            continue
+        kept_terms.append(terms)
+        used = total
+    stats = {"evidence_tokens": used, "sentences_total": n_sentences, "sentences_kept": len(kept_terms),
+             "chunks_cited": len(by_chunk)}
+    return _render(by_chunk, retrieved), stats
+
+__all__ = ["pack_evidence", "legacy_evidence", "count_tokens"]
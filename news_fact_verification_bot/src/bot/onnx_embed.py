@@ -0,0 +1,174 @@
+"""ONNX Runtime CPU embedding backend (optionally int8 dynamically quantised).
+
+The configured sentence-transformers model is exported once to ONNX together with its
+tokenizer and pooling configuration, so encoding uses the same tokenisation (including
+`do_lower_case`), pooling (mean / cls / max) and normalisation as the PyTorch path,
+without torch at query time. Models with other pooling modes or extra modules (e.g.
+Dense) are rejected at export rather than silently encoded differently.
+
+    python -m bot.onnx_embed --export            # writes ONNX_MODEL_DIR/<model>/
+    EMBED_BACKEND=onnx python -m bot.embed --input data/processed --persist-dir data/index
+
+Requires the `onnx` extra (`pip install -e .[onnx]`); exporting additionally needs torch.
+"""
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+import numpy as np
+from .config import settings
+
+CONFIG_FILE = "encoder_config.json"
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+def model_dir(model_name: str | None = None, root: str | None = None) -> Path:
+    name = (model_name or settings.embed_model).replace("/", "__")
+    return Path(root or settings.onnx_model_dir) / name
+
+# pre-v5 sentence-transformers Pooling configs use one boolean flag per mode
+_LEGACY_POOLING_FLAGS = {
+    "pooling_mode_cls_token": "cls",
+    "pooling_mode_mean_tokens": "mean",
+    "pooling_mode_max_tokens": "max",
+    "pooling_mode_mean_sqrt_len_tokens": "mean_sqrt_len_tokens",
+    "pooling_mode_weightedmean_tokens": "weightedmean",
+    "pooling_mode_lasttoken": "lasttoken",
+}
+SUPPORTED_POOLING = ("mean", "cls", "max")
+
+def _pooling_config(st_model) -> dict:
+    """Encoder settings for a Transformer -> Pooling [-> Normalize] pipeline.
+
+    Raises ValueError for anything the ONNX path would not reproduce exactly (other
+    modules such as Dense, combined or unsupported pooling modes).
+    """
+    modules = list(st_model)
+    names = [type(m).__name__ for m in modules]
+    if names[:2] != ["Transformer", "Pooling"] or names[2:] not in ([], ["Normalize"]):
+        raise ValueError(f"unsupported sentence-transformers pipeline for ONNX export: {' -> '.join(names)} "
+                         "(expected Transformer -> Pooling [-> Normalize])")
+    cfg = modules[1].get_config_dict()
+    if "pooling_mode" in cfg:
+        modes = [cfg["pooling_mode"]] if isinstance(cfg["pooling_mode"], str) else list(cfg["pooling_mode"])
+    else:
+        modes = [mode for flag, mode in _LEGACY_POOLING_FLAGS.items() if cfg.get(flag)]
+    if len(modes) != 1 or modes[0] not in SUPPORTED_POOLING:
+        raise ValueError(f"unsupported pooling mode for ONNX export: {modes} (supported: {', '.join(SUPPORTED_POOLING)})")
+    return {
+        "mode": modes[0],
+        "normalize": names[2:] == ["Normalize"],
+        "do_lower_case": bool(getattr(modules[0], "do_lower_case", False)),
+    }
+
+def export_onnx(model_name: str | None = None, out_dir: Path | None = None, quantize: bool = True, opset: int = 17) -> Path:
+    """Export a sentence-transformers model's transformer to ONNX (+ int8 copy)."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    model_name = model_name or settings.embed_model
+    out_dir = Path(out_dir or model_dir(model_name))
+    st = SentenceTransformer(model_name, device="cpu")
+    pooling = _pooling_config(st)  # fail before writing anything
+    out_dir.mkdir(parents=True, exist_ok=True)
+    transformer = st[0].auto_model.eval()
+    tokenizer = st.tokenizer
+    dummy = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in dummy]
+    dynamic = {n: {0: "batch", 1: "seq"} for n in input_names}
+    dynamic["last_hidden_state"] = {0: "batch", 1: "seq"}
+
+    class _Wrapper(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, *args):
+            return self.inner(**dict(zip(input_names, args))).last_hidden_state
+
+    with torch.no_grad():
+        torch.onnx.export(
+            _Wrapper(transformer), tuple(dummy[n] for n in input_names), str(out_dir / FP32_FILE),
+            input_names=input_names, output_names=["last_hidden_state"],
+            dynamic_axes=dynamic, opset_version=opset, dynamo=False,
+        )
+    tokenizer.save_pretrained(str(out_dir))
+    config = {"model_name": model_name, "input_names": input_names,
+              "max_seq_length": st.max_seq_length, **pooling}
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(out_dir / FP32_FILE), str(out_dir / INT8_FILE), weight_type=QuantType.QInt8)
+    (out_dir / CONFIG_FILE).write_text(json.dumps(config, indent=2))
+    return out_dir
+
+class OnnxEncoder:
+    """Drop-in for `SentenceTransformer.encode` backed by ONNX Runtime on CPU."""
+
+    def __init__(self, path: str | Path | None = None, quantized: bool | None = None, threads: int | None = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        self.path = Path(path or model_dir())
+        self.config = json.loads((self.path / CONFIG_FILE).read_text())
+        quantized = settings.onnx_quantize if quantized is None else quantized
+        onnx_file = self.path / (INT8_FILE if quantized and (self.path / INT8_FILE).exists() else FP32_FILE)
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads or os.getenv("ONNX_THREADS"):
+            opts.intra_op_num_threads = int(threads or os.getenv("ONNX_THREADS"))
+        self.session = ort.InferenceSession(str(onnx_file), opts, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.path))
+        self.model_file = onnx_file.name
+
+    def _pool(self, hidden: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        mode = self.config["mode"]
+        if mode == "cls":
+            return hidden[:, 0]
+        m = mask[..., None].astype(hidden.dtype)
+        if mode == "max":
+            return np.where(m > 0, hidden, -1e9).max(axis=1)
+        return (hidden * m).sum(axis=1) / np.clip(m.sum(axis=1), 1e-9, None)
+
+    def encode(self, sentences, batch_size: int = 32, normalize_embeddings: bool = False, **_):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if self.config.get("do_lower_case"):
+            texts = [t.lower() for t in texts]
+        # length-sorted batches keep padding (and wasted compute) small, as sentence-transformers does
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        chunks = []
+        for s in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[s:s + batch_size]]
+            enc = self.tokenizer(batch, padding=True, truncation=True,
+                                 max_length=self.config["max_seq_length"], return_tensors="np")
+            feeds = {n: enc[n].astype(np.int64) for n in self.config["input_names"]}
+            hidden = self.session.run(None, feeds)[0]
+            chunks.append(self._pool(hidden, enc["attention_mask"]))
+        if not chunks:
+            return np.zeros((0, 0), dtype=np.float32)
+        emb = np.concatenate(chunks).astype(np.float32)
+        out = np.empty_like(emb)
+        out[order] = emb
+        if normalize_embeddings or self.config["normalize"]:
+            out /= np.linalg.norm(out, axis=1, keepdims=True) + 1e-12
+        return out[0] if single else out
+
+def load_onnx_encoder(model_name: str | None = None) -> OnnxEncoder:
+    """Open the exported model, exporting it on first use."""
+    path = model_dir(model_name)
+    if not (path / CONFIG_FILE).exists():
+        export_onnx(model_name, path, quantize=settings.onnx_quantize)
+    return OnnxEncoder(path)
+
+__all__ = ["OnnxEncoder", "export_onnx", "load_onnx_encoder", "model_dir"]
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--export", action="store_true", help="Export the configured model to ONNX")
+    ap.add_argument("--model", default=None, help="Model name (default: EMBED_MODEL)")
+    ap.add_argument("--out-dir", default=None)
+    ap.add_argument("--no-quantize", action="store_true")
+    args = ap.parse_args()
+    if not args.export:
+        raise SystemExit("Nothing to do (use --export)")
+    path = export_onnx(args.model, Path(args.out_dir) if args.out_dir else None, quantize=not args.no_quantize)
+    print(f"[onnx] exported -> {path}")
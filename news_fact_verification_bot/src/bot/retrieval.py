@@ -1,27 +1,26 @@
 from __future__ import annotations
 import time
 from datetime import datetime, timedelta
-import chromadb
-from chromadb import PersistentClient
-from .config import settings
+from .vector_backends import ChromaBackend, get_backend
 
 DATE_FMT = "%Y-%m-%d"
 
 class Retriever:
-    def __init__(self, client: PersistentClient | None = None):
-        self.client = client or chromadb.PersistentClient(path=settings.chroma_persist_dir)
-        self.collection = self.client.get_or_create_collection("news_chunks")
+    def __init__(self, client=None, backend=None):
+        if client is not None:
+            backend = ChromaBackend(client=client)
+        self.backend = backend or get_backend()
 
     def query(self, claim: str, k: int = 8, days: int | None = 30, source_diversity: int = 3):
         t0 = time.time()
-        res = self.collection.query(query_texts=[claim], n_results=k*3)  # oversample
+        cutoff = None
+        if days:
+            cutoff = datetime.utcnow() - timedelta(days=days)
+        res = self.backend.query(claim, n=k*3, since=cutoff)  # oversample
         docs = res["documents"][0]
         metas = res["metadatas"][0]
         ids = res["ids"][0]
         items = []
-        cutoff = None
-        if days:
-            cutoff = datetime.utcnow() - timedelta(days=days)
         seen_sources = {}
         for doc, meta, _id in zip(docs, metas, ids):
             pub = meta.get("published_at") if meta else None
@@ -20,6 +20,7 @@ class Verdict(BaseModel):
     rationale: str
     cited_sources: List[Source]
     retrieval_stats: RetrievalStats
+    prompt_tokens: Optional[int] = None  # LLM prompt size (llm verdict mode only)
 
 class LabeledClaim(BaseModel):
     claim: str
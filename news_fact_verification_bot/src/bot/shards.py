@@ -0,0 +1,235 @@
+"""Time-partitioned index shards.
+
+Chunks are routed by `published_at` into per-period shards (`news_chunks__2025-W28`
+for weekly, `news_chunks__2025-07` for monthly, `news_chunks__undated` otherwise).
+A query only fans out to shards whose period overlaps the requested window (plus the
+undated shard, which the retriever's date filter never excludes), searches them in
+parallel and merges top-k by distance, so cost follows the window, not the archive.
+
+Retention / compaction:
+    python -m bot.shards list
+    python -m bot.shards retain --keep-days 365
+    python -m bot.shards compact --older-than-days 90
+"""
+from __future__ import annotations
+import heapq
+from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Sequence
+from .config import settings
+from .vector_backends import ChromaBackend, NumpyBackend, _as_day, _collection_name
+
+SHARD_SEP = "__"
+UNDATED = "undated"
+
+def shard_key(published_at: str | None, period: str = "week") -> str:
+    try:
+        d = date.fromisoformat((published_at or "")[:10])
+    except ValueError:
+        return UNDATED
+    if period == "week":
+        year, week, _ = d.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return f"{d.year}-{d.month:02d}"
+    raise ValueError(f"unknown shard period: {period}")
+
+def shard_range(key: str) -> tuple[date, date] | None:
+    """Inclusive (first_day, last_day) covered by a shard key; None for undated."""
+    if key == UNDATED:
+        return None
+    if "-W" in key:
+        year, week = key.split("-W")
+        start = date.fromisocalendar(int(year), int(week), 1)
+        return start, start + timedelta(days=6)
+    year, month = (int(p) for p in key.split("-"))
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+def shards_for_window(keys: Sequence[str], since: str | date | datetime | None) -> list[str]:
+    since_day = _as_day(since)
+    if since_day is None:
+        return list(keys)
+    out = []
+    for key in keys:
+        rng = shard_range(key)
+        if rng is None or rng[1].toordinal() >= since_day:
+            out.append(key)
+    return out
+
+class ShardedIndex:
+    """Backend-compatible facade over one backend instance per time shard."""
+
+    def __init__(self, kind: str | None = None, period: str | None = None, persist_dir: str | None = None,
+                 index_dir: str | None = None, max_workers: int = 8,
+                 encoder: Callable[[str], Sequence[float]] | None = None, **backend_kwargs):
+        self.kind = kind or settings.vector_backend
+        self.encoder = encoder
+        self.period = period or settings.shard_period or "week"
+        self.max_workers = max_workers
+        self.backend_kwargs = backend_kwargs
+        self._shards: dict = {}
+        if self.kind == "chroma":
+            import chromadb
+            from chromadb.config import Settings as ChromaSettings
+            self.client = chromadb.PersistentClient(
+                path=persist_dir or settings.chroma_persist_dir,
+                settings=ChromaSettings(allow_reset=True)
+            )
+        elif self.kind == "numpy":
+            self.root = Path(index_dir or settings.numpy_index_dir)
+        else:
+            raise ValueError(f"unknown vector backend: {self.kind}")
+
+    # ---- shard bookkeeping ------------------------------------------------
+    def shard_keys(self) -> list[str]:
+        prefix = _collection_name + SHARD_SEP
+        if self.kind == "chroma":
+            names = [getattr(c, "name", c) for c in self.client.list_collections()]
+        else:
+            names = [p.name for p in self.root.glob(prefix + "*") if (p / "manifest.json").exists()]
+        keys = {n[len(prefix):] for n in names if n.startswith(prefix)}
+        keys |= set(self._shards)  # opened but not yet persisted
+        return sorted(keys)
+
+    def shard(self, key: str):
+        if key not in self._shards:
+            name = f"{_collection_name}{SHARD_SEP}{key}"
+            if self.kind == "chroma":
+                self._shards[key] = ChromaBackend(client=self.client, collection=name, encoder=self.encoder)
+            else:
+                self._shards[key] = NumpyBackend(index_dir=str(self.root / name), encoder=self.encoder,
+                                                 **self.backend_kwargs)
+        return self._shards[key]
+
+    # ---- backend surface --------------------------------------------------
+    def add(self, ids: list[str], documents: list[str], metadatas: list[dict], embeddings: list[list[float]] | None = None):
+        groups: dict[str, list[int]] = {}
+        for i, meta in enumerate(metadatas):
+            groups.setdefault(shard_key((meta or {}).get("published_at"), self.period), []).append(i)
+        for key, rows in groups.items():
+            self.shard(key).add(
+                ids=[ids[i] for i in rows],
+                documents=[documents[i] for i in rows],
+                metadatas=[metadatas[i] for i in rows],
+                embeddings=[embeddings[i] for i in rows] if embeddings is not None else None,
+            )
+
+    def persist(self):
+        for be in self._shards.values():
+            be.persist()
+
+    def count(self) -> int:
+        return sum(self.shard(k).count() for k in self.shard_keys())
+
+    def get_all(self):
+        out: tuple[list, list, list, list] = ([], [], [], [])
+        for key in self.shard_keys():
+            for col, part in zip(out, self.shard(key).get_all()):
+                col.extend(part)
+        return out
+
+    def query(self, text: str | None = None, n: int = 8, embedding: Sequence[float] | None = None,
+              since: str | date | None = None, sources: list[str] | None = None):
+        keys = shards_for_window(self.shard_keys(), since)
+        if embedding is None and keys:
+            embedding = self.shard(keys[0])._encode(text)  # encode once for every shard
+
+        def one(key):
+            return self.shard(key).query(text, n=n, embedding=embedding, since=since, sources=sources)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(keys)))) as ex:
+            results = list(ex.map(one, keys))
+        merged = []
+        for res in results:
+            if not res["ids"] or not res["ids"][0]:
+                continue
+            for row in zip(res["distances"][0], res["ids"][0], res["documents"][0], res["metadatas"][0]):
+                merged.append(row)
+        top = heapq.nsmallest(n, merged, key=lambda r: r[0])
+        return {
+            "ids": [[r[1] for r in top]],
+            "documents": [[r[2] for r in top]],
+            "metadatas": [[r[3] for r in top]],
+            "distances": [[r[0] for r in top]],
+        }
+
+    # ---- retention / compaction ------------------------------------------
+    def drop_shard(self, key: str):
+        self.shard(key).drop()
+        self._shards.pop(key, None)
+
+    def merge_shards(self, keys: Sequence[str], into: str | None = None, period: str = "month"):
+        """Move every row of `keys` into shard `into` or, when `into` is None, into the
+        `period` shard of the row's own `published_at` (so shard ranges stay exact)."""
+        for key in keys:
+            if key == into:
+                continue
+            ids, docs, metas, embs = self.shard(key).get_all()
+            groups: dict[str, list[int]] = {}
+            for i, meta in enumerate(metas):
+                dest = into or shard_key((meta or {}).get("published_at"), period)
+                groups.setdefault(dest, []).append(i)
+            for dest, rows in groups.items():
+                target = self.shard(dest)
+                for s in range(0, len(rows), 1024):
+                    part = rows[s:s + 1024]
+                    target.add(ids=[ids[i] for i in part], documents=[docs[i] for i in part],
+                               metadatas=[metas[i] for i in part], embeddings=[embs[i] for i in part])
+                target.persist()
+            self.drop_shard(key)
+
+    def retain(self, keep_days: int, today: date | None = None) -> list[str]:
+        """Drop dated shards that end before the retention window. Returns dropped keys."""
+        cutoff = (today or datetime.utcnow().date()) - timedelta(days=keep_days)
+        keep = set(shards_for_window(self.shard_keys(), cutoff))
+        dropped = [k for k in self.shard_keys() if k not in keep]
+        for key in dropped:
+            self.drop_shard(key)
+        return dropped
+
+    def compact(self, older_than_days: int, today: date | None = None) -> dict[str, list[str]]:
+        """Merge weekly shards that end before the cutoff into monthly shards.
+
+        Rows are filed by their own month, so a week straddling two months is split
+        between both (and listed under both in the returned plan).
+        """
+        cutoff = ((today or datetime.utcnow().date()) - timedelta(days=older_than_days)).toordinal()
+        plan: dict[str, list[str]] = {}
+        weeks: list[str] = []
+        for key in self.shard_keys():
+            rng = shard_range(key)
+            if "-W" not in key or rng is None or rng[1].toordinal() >= cutoff:
+                continue
+            weeks.append(key)
+            for month in dict.fromkeys(shard_key(d.isoformat(), "month") for d in rng):
+                plan.setdefault(month, []).append(key)
+        self.merge_shards(weeks)
+        return plan
+
+__all__ = ["ShardedIndex", "shard_key", "shard_range", "shards_for_window"]
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("command", choices=["list", "retain", "compact"])
+    ap.add_argument("--backend", choices=["chroma", "numpy"], default=None)
+    ap.add_argument("--persist-dir", default=None, help="Chroma dir or numpy index root")
+    ap.add_argument("--keep-days", type=int, default=365, help="retain: drop shards entirely older than this")
+    ap.add_argument("--older-than-days", type=int, default=90, help="compact: merge older weekly shards into months")
+    args = ap.parse_args()
+    kind = args.backend or settings.vector_backend
+    idx = ShardedIndex(kind, persist_dir=args.persist_dir if kind == "chroma" else None,
+                       index_dir=args.persist_dir if kind == "numpy" else None)
+    if args.command == "list":
+        for key in idx.shard_keys():
+            print(f"{key}\t{idx.shard(key).count()}")
+    elif args.command == "retain":
+        dropped = idx.retain(args.keep_days)
+        print(f"[retain] dropped {len(dropped)} shard(s): {', '.join(dropped) or '-'}")
+    else:
+        plan = idx.compact(args.older_than_days)
+        for month, weeks in plan.items():
+            print(f"[compact] {', '.join(weeks)} -> {month}")
+        print(f"[compact] merged {len({w for ws in plan.values() for w in ws})} shard(s) into {len(plan)}")
@@ -0,0 +1,283 @@
+"""Portable, versioned index snapshot (single file, read-only, memory-mappable).
+
+Layout of a `.nfsnap` file:
+
+    MAGIC (8 bytes) | manifest length (uint64 LE) | manifest JSON | sections...
+
+Every section is a raw little-endian array aligned to 64 bytes; the manifest records
+its offset (relative to the first section), dtype, shape and sha256. Sections hold
+the normalised vectors (float16 / int8 + per-row scales), ids / texts / metadata
+(utf-8 blobs + offsets), date / source codes for filtering and the BM25 structures
+(vocabulary, idf, CSR postings, doc lengths). Opening a snapshot maps the file once
+read-only, so N worker processes on a host share a single page-cache copy.
+
+    python -m bot.snapshot export --out data/snapshots/index.nfsnap
+    python -m bot.snapshot import --snapshot data/snapshots/index.nfsnap --persist-dir data/index
+    python -m bot.snapshot verify --snapshot data/snapshots/index.nfsnap
+"""
+from __future__ import annotations
+import hashlib
+import json
+import struct
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from .config import settings
+from .vector_backends import NumpyBackend, published_day
+
+MAGIC = b"NFSNAP01"
+FORMAT_VERSION = 1
+_ALIGN = 64
+
+def _pad(n: int) -> int:
+    return (-n) % _ALIGN
+
+def _blob(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+class _BlobColumn(Sequence):
+    """Lazy sequence of strings decoded on access from a mapped blob + offsets."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, decode=None):
+        self._blob = blob
+        self._offsets = offsets
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        s = self._blob[self._offsets[i]:self._offsets[i + 1]].tobytes().decode("utf-8")
+        return self._decode(s) if self._decode else s
+
+def write_snapshot(out_path: Path, ids: list[str], documents: list[str], metadatas: list[dict], embeddings,
+                   dtype: str = "float16", bm25=None, embed_model: str | None = None) -> dict:
+    """Serialise rows (and BM25 structures built over the same texts) into one snapshot file."""
+    from .bm25_baseline import BM25Baseline
+    out_path = Path(out_path)
+    if len(ids) == 0:
+        raise ValueError("cannot snapshot an empty index (no rows to export)")
+    x = np.array(embeddings, dtype=np.float32).reshape(len(ids), -1)
+    x /= np.linalg.norm(x, axis=1, keepdims=True) + 1e-12
+    metadatas = [m or {} for m in metadatas]
+    sections: dict[str, np.ndarray] = {}
+    if dtype == "int8":
+        scales = np.abs(x).max(axis=1) / 127.0 + 1e-12
+        sections["vectors"] = np.round(x / scales[:, None]).astype(np.int8)
+        sections["scales"] = scales.astype(np.float32)
+    elif dtype in ("float16", "float32"):
+        sections["vectors"] = x.astype(dtype)
+    else:
+        raise ValueError(f"unsupported snapshot dtype: {dtype}")
+    sections["ids_blob"], sections["ids_offsets"] = _blob(ids)
+    sections["text_blob"], sections["text_offsets"] = _blob(documents)
+    sections["meta_blob"], sections["meta_offsets"] = _blob([json.dumps(m, ensure_ascii=False) for m in metadatas])
+    source_vocab: dict[str, int] = {}
+    sections["days"] = np.array([published_day(m.get("published_at")) for m in metadatas], dtype=np.int32)
+    sections["source_codes"] = np.array([source_vocab.setdefault(m.get("source") or "", len(source_vocab))
+                                         for m in metadatas], dtype=np.int32)
+    # BM25 over exactly the snapshot texts so lexical and dense results share row ids
+    bm25 = bm25 or BM25Baseline.from_records(list(documents), metadatas)
+    okapi = bm25.bm25
+    vocab = sorted(okapi.idf)
+    term_row = {t: i for i, t in enumerate(vocab)}
+    postings: list[list[tuple[int, int]]] = [[] for _ in vocab]
+    for doc_id, freqs in enumerate(okapi.doc_freqs):
+        for term, tf in freqs.items():
+            postings[term_row[term]].append((doc_id, tf))
+    indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum([len(p) for p in postings], out=indptr[1:])
+    flat = [pair for plist in postings for pair in plist]
+    sections["bm25_vocab_blob"], sections["bm25_vocab_offsets"] = _blob(vocab)
+    sections["bm25_idf"] = np.array([okapi.idf[t] for t in vocab], dtype=np.float64)
+    sections["bm25_indptr"] = indptr
+    sections["bm25_docs"] = np.array([d for d, _ in flat], dtype=np.int32)
+    sections["bm25_tf"] = np.array([tf for _, tf in flat], dtype=np.int32)
+    sections["bm25_doc_len"] = np.array(okapi.doc_len, dtype=np.int32)
+
+    layout, offset = {}, 0
+    for name, arr in sections.items():
+        arr = np.ascontiguousarray(arr)
+        sections[name] = arr
+        layout[name] = {"offset": offset, "nbytes": int(arr.nbytes), "dtype": arr.dtype.str,
+                        "shape": list(arr.shape), "sha256": hashlib.sha256(arr.tobytes()).hexdigest()}
+        offset += arr.nbytes + _pad(arr.nbytes)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "embed_model": embed_model or settings.embed_model,
+        "count": len(ids),
+        "dim": int(x.shape[1]),
+        "vector_dtype": dtype,
+        "sources": list(source_vocab),
+        "bm25": {"k1": okapi.k1, "b": okapi.b, "epsilon": okapi.epsilon, "avgdl": okapi.avgdl},
+        "sections": layout,
+    }
+    header = json.dumps(manifest).encode("utf-8")
+    head_len = len(MAGIC) + 8 + len(header)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    with tmp.open("wb") as wf:
+        wf.write(MAGIC + struct.pack("<Q", len(header)) + header + b"\0" * _pad(head_len))
+        for arr in sections.values():
+            wf.write(arr.tobytes())
+            wf.write(b"\0" * _pad(arr.nbytes))
+    tmp.replace(out_path)  # readers never observe a partial file
+    return manifest
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path: str | Path, verify: bool = False):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not an index snapshot")
+            (hlen,) = struct.unpack("<Q", f.read(8))
+            self.manifest = json.loads(f.read(hlen).decode("utf-8"))
+        if self.manifest["format_version"] > FORMAT_VERSION:
+            raise ValueError(f"snapshot format {self.manifest['format_version']} is newer than supported ({FORMAT_VERSION})")
+        head_len = len(MAGIC) + 8 + hlen
+        self._data_start = head_len + _pad(head_len)
+        self._buf = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if verify:
+            self.verify()
+
+    def array(self, name: str) -> np.ndarray:
+        spec = self.manifest["sections"][name]
+        start = self._data_start + spec["offset"]
+        raw = self._buf[start:start + spec["nbytes"]]
+        return raw.view(np.dtype(spec["dtype"])).reshape(spec["shape"])
+
+    def has(self, name: str) -> bool:
+        return name in self.manifest["sections"]
+
+    def verify(self):
+        for name, spec in self.manifest["sections"].items():
+            digest = hashlib.sha256(self.array(name).tobytes()).hexdigest()
+            if digest != spec["sha256"]:
+                raise ValueError(f"snapshot section {name!r} failed checksum")
+
+    @property
+    def ids(self) -> _BlobColumn:
+        return _BlobColumn(self.array("ids_blob"), self.array("ids_offsets"))
+
+    @property
+    def documents(self) -> _BlobColumn:
+        return _BlobColumn(self.array("text_blob"), self.array("text_offsets"))
+
+    @property
+    def metadatas(self) -> _BlobColumn:
+        return _BlobColumn(self.array("meta_blob"), self.array("meta_offsets"), decode=json.loads)
+
+    def embeddings(self) -> np.ndarray:
+        x = np.asarray(self.array("vectors"), dtype=np.float32)
+        if self.has("scales"):
+            x = x * self.array("scales")[:, None]
+        return x
+
+class SnapshotBM25:
+    """BM25Okapi-compatible scorer over the snapshot's CSR postings (no re-tokenising)."""
+
+    def __init__(self, snap: Snapshot):
+        params = snap.manifest["bm25"]
+        self.k1, self.b, self.avgdl = params["k1"], params["b"], params["avgdl"]
+        vocab = _BlobColumn(snap.array("bm25_vocab_blob"), snap.array("bm25_vocab_offsets"))
+        self._term_row = {t: i for i, t in enumerate(vocab)}
+        self.idf = snap.array("bm25_idf")
+        self.indptr = snap.array("bm25_indptr")
+        self.docs = snap.array("bm25_docs")
+        self.tf = snap.array("bm25_tf")
+        self.doc_len = snap.array("bm25_doc_len")
+        self.corpus_size = len(self.doc_len)
+
+    def get_scores(self, query: list[str]) -> np.ndarray:
+        score = np.zeros(self.corpus_size)
+        for q in query:
+            row = self._term_row.get(q)
+            if row is None:
+                continue
+            s, e = self.indptr[row], self.indptr[row + 1]
+            docs = self.docs[s:e]
+            tf = self.tf[s:e].astype(np.float64)
+            norm = self.k1 * (1 - self.b + self.b * self.doc_len[docs] / self.avgdl)
+            score[docs] += self.idf[row] * (tf * (self.k1 + 1) / (tf + norm))
+        return score
+
+def open_numpy_backend(snap: Snapshot | str | Path, nprobe: int | None = None) -> NumpyBackend:
+    """Serve a snapshot through the numpy backend without copying it (read-only)."""
+    if not isinstance(snap, Snapshot):
+        snap = Snapshot(snap)
+    be = NumpyBackend.from_arrays(
+        snap.array("vectors"), snap.array("scales") if snap.has("scales") else None,
+        snap.array("days"), snap.array("source_codes"), snap.manifest["sources"],
+        snap.ids, snap.documents, snap.metadatas,
+        manifest=snap.manifest, index_dir=snap.path, nprobe=nprobe, read_only=True,
+    )
+    be.snapshot = snap
+    return be
+
+def export_snapshot(out_path: Path, store=None, dtype: str = "float16") -> dict:
+    """Export the rows of a `VectorStore` (any backend) into a snapshot file."""
+    from .vector_store import VectorStore
+    store = store or VectorStore()
+    ids, docs, metas, embs = store.backend.get_all()
+    return write_snapshot(out_path, ids, docs, metas, embs, dtype=dtype)
+
+def import_snapshot(snap: Snapshot | str | Path, store=None, batch: int = 1024) -> int:
+    """Load snapshot rows into a `VectorStore` (e.g. a fresh Chroma collection)."""
+    from .vector_store import VectorStore
+    if not isinstance(snap, Snapshot):
+        snap = Snapshot(snap, verify=True)
+    store = store or VectorStore()
+    ids, docs, metas = snap.ids, snap.documents, snap.metadatas
+    n = snap.manifest["count"]
+    for s in range(0, n, batch):
+        e = min(n, s + batch)
+        rows = np.asarray(snap.array("vectors")[s:e], dtype=np.float32)
+        if snap.has("scales"):
+            rows *= snap.array("scales")[s:e, None]
+        store.add(ids=ids[s:e], documents=docs[s:e], metadatas=metas[s:e], embeddings=rows.tolist())
+    store.persist()
+    return n
+
+__all__ = ["Snapshot", "SnapshotBM25", "write_snapshot", "export_snapshot", "import_snapshot", "open_numpy_backend"]
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("command", choices=["export", "import", "verify", "info"])
+    ap.add_argument("--snapshot", help="Snapshot path (import / verify / info)")
+    ap.add_argument("--out", help="Snapshot output path (export)")
+    ap.add_argument("--backend", choices=["chroma", "numpy"], default=None)
+    ap.add_argument("--persist-dir", default=None, help="Source (export) or target (import) index directory")
+    ap.add_argument("--dtype", choices=["float16", "int8", "float32"], default="float16")
+    args = ap.parse_args()
+    from .vector_store import VectorStore
+    if args.command == "export":
+        if not args.out:
+            raise SystemExit("--out is required for export")
+        try:
+            m = export_snapshot(Path(args.out), VectorStore(args.persist_dir, backend=args.backend), dtype=args.dtype)
+        except ValueError as e:
+            raise SystemExit(f"[snapshot] {e}")
+        print(f"[snapshot] wrote {m['count']} rows ({m['vector_dtype']}, dim={m['dim']}) -> {args.out}")
+    elif args.command == "import":
+        n = import_snapshot(args.snapshot, VectorStore(args.persist_dir, backend=args.backend))
+        print(f"[snapshot] imported {n} rows from {args.snapshot}")
+    else:
+        snap = Snapshot(args.snapshot, verify=args.command == "verify")
+        if args.command == "verify":
+            print(f"[snapshot] {args.snapshot}: all {len(snap.manifest['sections'])} sections OK")
+        else:
+            print(json.dumps({k: v for k, v in snap.manifest.items() if k != "sections"}, indent=2))
@@ -0,0 +1,373 @@
+"""Pluggable vector backends.
+
+Both backends expose the same small surface (`add`, `query`, `count`, `persist`,
+`get_all`, `drop`) and
+return Chroma-shaped results (`{"ids": [[...]], "documents": [[...]], ...}`) so the
+retriever does not care which one is active.
+
+- `ChromaBackend`: the original Chroma `PersistentClient` collection.
+- `NumpyBackend`: in-process index for read-mostly query nodes. Embeddings are
+  L2-normalised and stored as int8 (per-row scale) or float16 `.npy` files that are
+  memory-mapped at query time. Small corpora use exact brute-force matrix products;
+  large ones are coarse-partitioned (IVF) with rows stored contiguously per list so
+  only `nprobe` slices are touched. Date / source filters are applied as vectorised
+  masks before scoring.
+"""
+from __future__ import annotations
+import json
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Sequence
+from .config import settings
+
+_collection_name = "news_chunks"
+
+def published_day(pub: str | None) -> int:
+    """Date string -> proleptic ordinal (-1 when missing / unparsable)."""
+    if not pub:
+        return -1
+    try:
+        return date.fromisoformat(pub[:10]).toordinal()
+    except ValueError:
+        return -1
+
+def _as_day(since: str | date | datetime | None) -> int | None:
+    if since is None:
+        return None
+    if isinstance(since, datetime):
+        return since.date().toordinal()
+    if isinstance(since, date):
+        return since.toordinal()
+    return published_day(since)
+
+class _QueryEncoder:
+    """Encode query text with the configured embedding backend (same model as the index)."""
+    _encoder: Callable[[str], Sequence[float]] | None = None
+
+    def _encode(self, text: str):
+        if self._encoder is None:
+            from .embed import load_encoder
+            model = load_encoder()
+            self._encoder = model.encode
+        return self._encoder(text)
+
+class ChromaBackend(_QueryEncoder):
+    name = "chroma"
+
+    def __init__(self, persist_dir: str | None = None, collection: str = _collection_name, client=None,
+                 encoder: Callable[[str], Sequence[float]] | None = None):
+        self._encoder = encoder
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
+        self.client = client or chromadb.PersistentClient(
+            path=persist_dir or settings.chroma_persist_dir,
+            settings=ChromaSettings(allow_reset=True)
+        )
+        self.collection = self.client.get_or_create_collection(collection)
+
+    def add(self, ids: list[str], documents: list[str], metadatas: list[dict], embeddings: list[list[float]] | None = None):
+        self.collection.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+
+    def query(self, text: str | None = None, n: int = 8, embedding: Sequence[float] | None = None,
+              since: str | date | None = None, sources: list[str] | None = None):
+        # published_at is stored as a string, which chroma cannot range-filter;
+        # the date window stays a caller-side post filter for this backend.
+        where = {"source": {"$in": list(sources)}} if sources else None
+        if embedding is None:
+            # encode with our model rather than chroma's default embedding function,
+            # which does not match the vectors written by build_vector_store
+            embedding = self._encode(text)
+        import numpy as np
+        # encoders return numpy arrays; chroma only accepts plain python floats
+        query = np.asarray(embedding, dtype=np.float32).tolist()
+        return self.collection.query(query_embeddings=[query], n_results=n, where=where)
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def persist(self):
+        pass  # PersistentClient writes through
+
+    def get_all(self):
+        res = self.collection.get(include=["documents", "metadatas", "embeddings"])
+        return res["ids"], res["documents"], res["metadatas"], [list(e) for e in res["embeddings"]]
+
+    def drop(self):
+        self.client.delete_collection(self.collection.name)
+
+class NumpyBackend(_QueryEncoder):
+    name = "numpy"
+
+    def __init__(self, index_dir: str | None = None, dtype: str | None = None, nlist: int | None = None,
+                 nprobe: int | None = None, encoder: Callable[[str], Sequence[float]] | None = None):
+        import numpy as np
+        self._np = np
+        self.index_dir = Path(index_dir or settings.numpy_index_dir)
+        self.dtype = dtype or settings.numpy_dtype
+        if self.dtype not in ("int8", "float16"):
+            raise ValueError(f"unsupported numpy index dtype: {self.dtype}")
+        self.nlist = settings.ivf_nlist if nlist is None else nlist
+        self.nprobe = nprobe or settings.ivf_nprobe
+        self._encoder = encoder
+        self._pending: list[tuple[str, str, dict, list[float]]] = []
+        self._loaded = False
+        self.read_only = False
+        if (self.index_dir / "manifest.json").exists():
+            self._load()
+
+    # ---- build side -------------------------------------------------------
+    def _check_writable(self):
+        if self.read_only:
+            raise ValueError(f"{self.index_dir} is served read-only; build or import into a chroma / numpy "
+                             "index (e.g. --backend numpy) instead of VECTOR_BACKEND=snapshot")
+
+    def add(self, ids: list[str], documents: list[str], metadatas: list[dict], embeddings: list[list[float]] | None = None):
+        self._check_writable()
+        if embeddings is None:
+            embeddings = [list(self._encode(d)) for d in documents]
+        self._pending.extend(zip(ids, documents, metadatas, embeddings))
+
+    def persist(self):
+        """Write pending rows (upserted into any existing index) to `index_dir`."""
+        self._check_writable()
+        np = self._np
+        if not self._pending:
+            return
+        ids, docs, metas, embs = [], [], [], []
+        if self._loaded:
+            ids, docs, metas = list(self.ids), list(self.documents), list(self.metadatas)
+            embs = [self._dequantize(np.arange(self.size))]
+        new_ids, new_docs, new_metas, new_embs = zip(*self._pending)
+        ids.extend(new_ids)
+        docs.extend(new_docs)
+        metas.extend(new_metas)
+        embs.append(np.asarray(new_embs, dtype=np.float32))
+        x = np.concatenate(embs)
+        # upsert: a re-added id replaces its stored row (last write wins)
+        last = {i: pos for pos, i in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            ids, docs, metas = [ids[k] for k in keep], [docs[k] for k in keep], [metas[k] for k in keep]
+            x = x[keep]
+        # release the memory maps before their files are rewritten
+        self.vectors = self.scales = None
+        self._loaded = False
+        write_numpy_index(self.index_dir, ids, docs, metas, x, dtype=self.dtype, nlist=self.nlist)
+        self._pending = []
+        self._load()
+
+    @classmethod
+    def from_arrays(cls, vectors, scales, days, source_codes, source_vocab: list[str], ids: Sequence[str],
+                    documents: Sequence[str], metadatas: Sequence[dict], centroids=None, list_offsets=None,
+                    manifest: dict | None = None, index_dir: str | Path | None = None, nprobe: int | None = None,
+                    encoder: Callable[[str], Sequence[float]] | None = None, read_only: bool = False) -> "NumpyBackend":
+        """Serve already loaded (e.g. memory-mapped) arrays instead of reading `index_dir`.
+
+        With `read_only`, `add` / `persist` / `drop` raise instead of writing to `index_dir`.
+        """
+        be = cls(index_dir=str(index_dir) if index_dir else None, nlist=0, nprobe=nprobe, encoder=encoder)
+        be._set_arrays(vectors, scales, days, source_codes, source_vocab, ids, documents, metadatas,
+                       centroids, list_offsets, manifest or {})
+        be.read_only = read_only
+        return be
+
+    # ---- query side -------------------------------------------------------
+    def _load(self):
+        np = self._np
+        d = self.index_dir
+        manifest = json.loads((d / "manifest.json").read_text())
+        ids, documents, metadatas = [], [], []
+        with (d / "rows.jsonl").open("r", encoding="utf-8") as f:
+            for line in f:
+                rec = json.loads(line)
+                ids.append(rec["id"])
+                documents.append(rec["text"])
+                metadatas.append(rec["meta"])
+        self._set_arrays(
+            np.load(d / "vectors.npy", mmap_mode="r"),
+            np.load(d / "scales.npy", mmap_mode="r") if manifest["dtype"] == "int8" else None,
+            np.load(d / "days.npy"), np.load(d / "source_codes.npy"), manifest["sources"],
+            ids, documents, metadatas,
+            np.load(d / "centroids.npy") if manifest["nlist"] else None,
+            np.load(d / "list_offsets.npy") if manifest["nlist"] else None,
+            manifest,
+        )
+
+    def _set_arrays(self, vectors, scales, days, source_codes, source_vocab, ids, documents, metadatas,
+                    centroids, list_offsets, manifest):
+        self.manifest = manifest
+        self.dtype = str(vectors.dtype)
+        self.vectors = vectors
+        self.scales = scales
+        self.days = days
+        self.source_codes = source_codes
+        self.source_vocab: list[str] = list(source_vocab)
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.ids, self.documents, self.metadatas = ids, documents, metadatas
+        self.size = len(ids)
+        self._loaded = True
+
+    def _dequantize(self, rows):
+        np = self._np
+        block = np.asarray(self.vectors[rows], dtype=np.float32)
+        if self.scales is not None:
+            block *= np.asarray(self.scales[rows], dtype=np.float32)[:, None]
+        return block
+
+    def _mask(self, rows, since_day: int | None, source_ids):
+        np = self._np
+        keep = np.ones(len(rows), dtype=bool)
+        if since_day is not None:
+            days = self.days[rows]
+            # undated rows pass, mirroring the retriever's post filter
+            keep &= (days < 0) | (days >= since_day)
+        if source_ids is not None:
+            keep &= np.isin(self.source_codes[rows], source_ids)
+        return rows[keep]
+
+    def _score(self, rows, q, block: int = 65536):
+        np = self._np
+        out = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), block):
+            sl = rows[start:start + block]
+            contiguous = len(sl) and sl[-1] - sl[0] + 1 == len(sl)
+            idx = slice(int(sl[0]), int(sl[-1]) + 1) if contiguous else sl
+            vec = np.asarray(self.vectors[idx], dtype=np.float32)
+            s = vec @ q
+            if self.scales is not None:
+                s *= np.asarray(self.scales[idx], dtype=np.float32)
+            out[start:start + len(sl)] = s
+        return out
+
+    def _candidate_rows(self, q):
+        np = self._np
+        if self.centroids is None:
+            return np.arange(self.size)
+        probes = np.argsort(-(self.centroids @ q))[:self.nprobe]
+        probes.sort()
+        return np.concatenate([np.arange(self.list_offsets[p], self.list_offsets[p + 1]) for p in probes])
+
+    def query(self, text: str | None = None, n: int = 8, embedding: Sequence[float] | None = None,
+              since: str | date | None = None, sources: list[str] | None = None):
+        np = self._np
+        empty = {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+        if not self._loaded or self.size == 0:
+            return empty
+        q = np.asarray(embedding if embedding is not None else self._encode(text), dtype=np.float32)
+        q = q / (np.linalg.norm(q) + 1e-12)
+        source_ids = None
+        if sources:
+            vocab = {s: i for i, s in enumerate(self.source_vocab)}
+            source_ids = np.array([vocab[s] for s in sources if s in vocab], dtype=np.int32)
+        rows = self._mask(self._candidate_rows(q), _as_day(since), source_ids)
+        if len(rows) == 0:
+            return empty
+        scores = self._score(rows, q)
+        top = np.argpartition(-scores, n - 1)[:n] if len(rows) > n else np.arange(len(rows))
+        top = top[np.argsort(-scores[top])]
+        sel = rows[top]
+        return {
+            "ids": [[self.ids[i] for i in sel]],
+            "documents": [[self.documents[i] for i in sel]],
+            "metadatas": [[self.metadatas[i] for i in sel]],
+            "distances": [[float(1.0 - s) for s in scores[top]]],
+        }
+
+    def count(self) -> int:
+        return (self.size if self._loaded else 0) + len(self._pending)
+
+    def get_all(self):
+        if not self._loaded:
+            return [], [], [], []
+        embs = self._dequantize(self._np.arange(self.size))
+        return list(self.ids), list(self.documents), list(self.metadatas), embs.tolist()
+
+    def drop(self):
+        self._check_writable()
+        self.vectors = self.scales = None
+        self._loaded = False
+        self._pending = []
+        shutil.rmtree(self.index_dir, ignore_errors=True)
+
+def _kmeans(x, k: int, iters: int = 10, seed: int = 0, sample: int = 65536):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    train = x[rng.choice(len(x), size=min(sample, len(x)), replace=False)]
+    cent = train[rng.choice(len(train), size=k, replace=False)].copy()
+    for _ in range(iters):
+        assign = np.argmax(train @ cent.T, axis=1)
+        for c in range(k):
+            members = train[assign == c]
+            if len(members):
+                cent[c] = members.mean(axis=0)
+        cent /= np.linalg.norm(cent, axis=1, keepdims=True) + 1e-12
+    return cent
+
+def write_numpy_index(index_dir: Path, ids: list[str], documents: list[str], metadatas: list[dict], embeddings,
+                      dtype: str = "int8", nlist: int = 0, ivf_min_rows: int = 50_000):
+    """Normalise, (optionally) IVF-partition, quantise and write a NumpyBackend index.
+
+    nlist=0 picks exact search below `ivf_min_rows` rows and ~4*sqrt(N) lists above.
+    """
+    import numpy as np
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    x = np.array(embeddings, dtype=np.float32)
+    x /= np.linalg.norm(x, axis=1, keepdims=True) + 1e-12
+    n = len(x)
+    if nlist == 0 and n >= ivf_min_rows:
+        nlist = int(4 * n ** 0.5)
+    nlist = min(nlist, n)
+    order = np.arange(n)
+    offsets = None
+    if nlist:
+        cent = _kmeans(x, nlist)
+        assign = np.concatenate([np.argmax(x[i:i + 65536] @ cent.T, axis=1) for i in range(0, n, 65536)])
+        order = np.argsort(assign, kind="stable")
+        offsets = np.searchsorted(assign[order], np.arange(nlist + 1)).astype(np.int64)
+        np.save(index_dir / "centroids.npy", cent)
+        np.save(index_dir / "list_offsets.npy", offsets)
+    else:
+        for stale in ("centroids.npy", "list_offsets.npy"):
+            (index_dir / stale).unlink(missing_ok=True)
+    x = x[order]
+    if dtype == "int8":
+        scales = np.abs(x).max(axis=1) / 127.0 + 1e-12
+        np.save(index_dir / "vectors.npy", np.round(x / scales[:, None]).astype(np.int8))
+        np.save(index_dir / "scales.npy", scales.astype(np.float32))
+    else:
+        np.save(index_dir / "vectors.npy", x.astype(np.float16))
+        (index_dir / "scales.npy").unlink(missing_ok=True)
+    source_vocab: dict[str, int] = {}
+    days = np.empty(n, dtype=np.int32)
+    codes = np.empty(n, dtype=np.int32)
+    with (index_dir / "rows.jsonl").open("w", encoding="utf-8") as wf:
+        for pos, i in enumerate(order):
+            meta = metadatas[i] or {}
+            days[pos] = published_day(meta.get("published_at"))
+            codes[pos] = source_vocab.setdefault(meta.get("source") or "", len(source_vocab))
+            wf.write(json.dumps({"id": ids[i], "text": documents[i], "meta": meta}, ensure_ascii=False) + "\n")
+    np.save(index_dir / "days.npy", days)
+    np.save(index_dir / "source_codes.npy", codes)
+    manifest = {"dtype": dtype, "dim": int(x.shape[1]) if n else 0, "count": n, "nlist": int(nlist),
+                "sources": list(source_vocab), "embed_model": settings.embed_model}
+    (index_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+def get_backend(kind: str | None = None, shard_period: str | None = None, **kwargs):
+    kind = kind or settings.vector_backend
+    if kind == "snapshot":
+        from .snapshot import open_numpy_backend
+        return open_numpy_backend(kwargs.get("index_dir") or settings.snapshot_path)
+    period = settings.shard_period if shard_period is None else shard_period
+    if period:
+        from .shards import ShardedIndex
+        return ShardedIndex(kind, period=period, **kwargs)
+    if kind == "chroma":
+        return ChromaBackend(**kwargs)
+    if kind == "numpy":
+        return NumpyBackend(**kwargs)
+    raise ValueError(f"unknown vector backend: {kind}")
+
+__all__ = ["ChromaBackend", "NumpyBackend", "get_backend", "write_numpy_index", "published_day"]
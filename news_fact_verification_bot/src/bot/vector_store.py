@@ -1,28 +1,28 @@
 from __future__ import annotations
-from pathlib import Path
-import chromadb
-from chromadb import PersistentClient
-from chromadb.config import Settings as ChromaSettings
 from .config import settings
-
-_collection_name = "news_chunks"
+from .vector_backends import get_backend
 
 class VectorStore:
-    def __init__(self, persist_dir: str | None = None):
-        persist_dir = persist_dir or settings.chroma_persist_dir
-        self.client: PersistentClient = chromadb.PersistentClient(
-            path=persist_dir,
-            settings=ChromaSettings(allow_reset=True)
-        )
-        self.collection = self.client.get_or_create_collection(_collection_name)
+    def __init__(self, persist_dir: str | None = None, backend: str | None = None, shard_period: str | None = None):
+        self.backend_name = backend or settings.vector_backend
+        if self.backend_name == "chroma":
+            self.backend = get_backend("chroma", shard_period=shard_period, persist_dir=persist_dir or settings.chroma_persist_dir)
+        else:
+            self.backend = get_backend(self.backend_name, shard_period=shard_period, index_dir=persist_dir)
+        # single-collection chroma exposes its client / collection as before
+        self.client = getattr(self.backend, "client", None)
+        self.collection = getattr(self.backend, "collection", None)
 
     def add(self, ids: list[str], documents: list[str], metadatas: list[dict], embeddings: list[list[float]] | None = None):
-        self.collection.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+        self.backend.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
 
     def query(self, text: str, n: int = 8):
-        return self.collection.query(query_texts=[text], n_results=n)
+        return self.backend.query(text, n=n)
 
     def count(self) -> int:
-        return self.collection.count()
+        return self.backend.count()
+
+    def persist(self):
+        self.backend.persist()
 
 __all__ = ["VectorStore"]
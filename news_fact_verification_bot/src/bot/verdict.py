@@ -2,6 +2,8 @@ from __future__ import annotations
 from typing import List
 import math
 from .schemas import Verdict as VerdictModel, Source, RetrievalStats
+from .config import settings
+from .evidence import count_tokens, legacy_evidence, pack_evidence
 import os
 try:
     # optional openai client if installed
@@ -41,15 +43,27 @@ PROMPT_TEMPLATE = (
     "Claim: {claim}\nEvidence Chunks:\n{evidence}\nRespond with ONLY JSON."
 )
 
-def llm_verdict(claim: str, retrieved: List[dict], stats: dict, model: str = "gpt-4o-mini") -> VerdictModel:
+def build_prompt(claim: str, retrieved: List[dict], token_budget: int | None = None, model: str | None = None) -> str:
+    """Prompt with packed evidence; token_budget=0 keeps the legacy 400-char-per-chunk evidence."""
+    budget = settings.evidence_token_budget if token_budget is None else token_budget
+    if budget <= 0:
+        evidence_str = legacy_evidence(retrieved)
+    else:
+        evidence_str, _ = pack_evidence(claim, retrieved, token_budget=budget, model=model)
+    return PROMPT_TEMPLATE.format(claim=claim, evidence=evidence_str)
+
+def llm_verdict(claim: str, retrieved: List[dict], stats: dict, model: str = "gpt-4o-mini", token_budget: int | None = None) -> VerdictModel:
     if OpenAI is None:
         return simple_verdict(claim, retrieved, stats)
     client = OpenAI()
-    evidence_str = "\n".join(f"[{i}] {r.get('title','')} :: {r['text'][:400]}" for i,r in enumerate(retrieved))
-    prompt = PROMPT_TEMPLATE.format(claim=claim, evidence=evidence_str)
+    prompt = build_prompt(claim, retrieved, token_budget=token_budget, model=model)
+    prompt_tokens = count_tokens(prompt, model)
     try:
         resp = client.chat.completions.create(model=model, messages=[{"role":"user","content":prompt}], temperature=0.2)
         content = resp.choices[0].message.content
+        usage = getattr(resp, "usage", None)
+        if getattr(usage, "prompt_tokens", None):
+            prompt_tokens = usage.prompt_tokens  # provider-reported count beats the estimate
         import json as _json
         parsed = _json.loads(content)
         verdict = parsed.get("verdict", "NEEDS_MORE_EVIDENCE")
@@ -58,7 +72,8 @@ def llm_verdict(claim: str, retrieved: List[dict], stats: dict, model: str = "gp
     except Exception as e:  # fallback
         verdict_model = simple_verdict(claim, retrieved, stats)
         rationale = verdict_model.rationale + f" | llm_error={e}"  # type: ignore
+        verdict_model.prompt_tokens = prompt_tokens
         return verdict_model
     sources = [Source(title=i.get("title", "(no title)"), url=i.get("url", ""), published_at=i.get("published_at")) for i in retrieved]
     rstats = RetrievalStats(**stats)
-    return VerdictModel(claim=claim, verdict=verdict, confidence=confidence, rationale=rationale, cited_sources=sources, retrieval_stats=rstats)
+    return VerdictModel(claim=claim, verdict=verdict, confidence=confidence, rationale=rationale, cited_sources=sources, retrieval_stats=rstats, prompt_tokens=prompt_tokens)
@@ -0,0 +1,68 @@
+from bot.dedup import dedupe_chunks
+
+WIRE = ("The central bank cut its benchmark interest rate by 50 basis points on Tuesday, "
+        "citing slowing growth and easing inflation across the region, officials said.")
+
+def test_dedupe_collapses_syndicated_copies():
+    records = [
+        {"id": "a::0", "text": WIRE, "source": "Wire", "url": "https://wire.example/a"},
+        {"id": "b::0", "text": WIRE + " Reporting by Staff.", "source": "Daily", "url": "https://daily.example/b"},
+        {"id": "c::0", "text": "Heavy rain caused flooding in the northern provinces overnight.", "source": "Local", "url": "https://local.example/c"},
+    ]
+    kept, stats = dedupe_chunks(records)
+    assert [r["id"] for r in kept] == ["a::0", "c::0"]
+    assert kept[0]["alt_sources"] == ["Daily"]
+    assert kept[0]["alt_urls"] == ["https://daily.example/b"]
+    assert kept[0]["dup_count"] == 1
+    assert "alt_urls" not in kept[1]
+    assert stats["chunks_in"] == 3 and stats["removed"] == 1
+
+def test_process_file_dedupes_against_earlier_ingests(tmp_path):
+    import json
+    from bot.data_ingest import process_file
+    raw, out = tmp_path / "raw", tmp_path / "processed"
+    raw.mkdir()
+    (raw / "pull1.jsonl").write_text(json.dumps({"id": "a", "content": WIRE, "source": "Wire", "url": "https://wire.example/a"}) + "\n")
+    (raw / "pull2.jsonl").write_text(
+        json.dumps({"id": "b", "content": WIRE, "source": "Daily", "url": "https://daily.example/b"}) + "\n"
+        + json.dumps({"id": "c", "content": "Heavy rain caused flooding in the northern provinces overnight."}) + "\n")
+    process_file(raw / "pull1.jsonl", out)
+    stats = process_file(raw / "pull2.jsonl", out)
+    assert stats["removed"] == 1 and stats["updated_existing"] == [0]
+    first = [json.loads(line) for line in (out / "pull1_chunks.jsonl").read_text().splitlines()]
+    second = [json.loads(line) for line in (out / "pull2_chunks.jsonl").read_text().splitlines()]
+    assert first[0]["alt_urls"] == ["https://daily.example/b"] and first[0]["dup_count"] == 1
+    assert [r["id"] for r in second] == ["c::0"]
+
+def test_reingest_keeps_duplicate_bookkeeping(tmp_path):
+    import json
+    from bot.data_ingest import process_file
+    raw, out = tmp_path / "raw", tmp_path / "processed"
+    raw.mkdir()
+    (raw / "pull1.jsonl").write_text(json.dumps({"id": "a", "content": WIRE, "source": "Wire", "url": "https://wire.example/a"}) + "\n")
+    (raw / "pull2.jsonl").write_text(json.dumps({"id": "b", "content": WIRE, "source": "Daily", "url": "https://daily.example/b"}) + "\n")
+    process_file(raw / "pull1.jsonl", out)
+    for _ in range(3):
+        process_file(raw / "pull2.jsonl", out)
+    process_file(raw / "pull1.jsonl", out)
+    (canon,) = [json.loads(line) for line in (out / "pull1_chunks.jsonl").read_text().splitlines()]
+    assert canon["dup_count"] == 1 and canon["dup_ids"] == ["b::0"]
+    assert canon["alt_sources"] == ["Daily"] and canon["alt_urls"] == ["https://daily.example/b"]
+    assert (out / "pull2_chunks.jsonl").read_text() == ""
+
+def test_earlier_chunks_are_signed_once(tmp_path, monkeypatch):
+    import json
+    from bot.data_ingest import process_file, signatures_path
+    from bot.dedup import MinHashDeduper
+    raw, out = tmp_path / "raw", tmp_path / "processed"
+    raw.mkdir()
+    (raw / "pull1.jsonl").write_text("".join(json.dumps({"id": f"a{i}", "content": f"{WIRE} Story {i} update."}) + "\n" for i in range(5)))
+    (raw / "pull2.jsonl").write_text(json.dumps({"id": "b", "content": WIRE + " Story 3 update."}) + "\n")
+    process_file(raw / "pull1.jsonl", out)
+    assert signatures_path(out / "pull1_chunks.jsonl").exists()
+    calls = []
+    original = MinHashDeduper.signature
+    monkeypatch.setattr(MinHashDeduper, "signature", lambda self, text: calls.append(text) or original(self, text))
+    stats = process_file(raw / "pull2.jsonl", out)
+    assert len(calls) == 1  # only the new chunk
+    assert stats["removed"] == 1
@@ -0,0 +1,22 @@
+from bot.evidence import count_tokens, pack_evidence
+
+RETRIEVED = [
+    {"title": "Rate cut", "text": "The central bank cut interest rates by 50 basis points. Markets rallied on the news. "
+                                  "The weather was mild across the capital."},
+    {"title": "Wire copy", "text": "The central bank cut interest rates by 50 basis points on Tuesday. Analysts expect more easing."},
+    {"title": "Sports", "text": "The local team won the cup final after extra time."},
+]
+
+def test_pack_evidence_selects_relevant_non_redundant_sentences():
+    evidence, stats = pack_evidence("Central bank cuts interest rates", RETRIEVED, token_budget=200)
+    assert evidence.startswith("[0] Rate cut :: The central bank cut interest rates by 50 basis points.")
+    assert "on Tuesday" not in evidence  # near-duplicate of the chunk 0 sentence
+    assert "weather" not in evidence and "cup final" not in evidence
+    assert stats["sentences_kept"] < stats["sentences_total"]
+
+def test_pack_evidence_respects_budget():
+    long_titles = [{**r, "title": f"{r['title']} - extended coverage and live updates from the newsroom"} for r in RETRIEVED]
+    for retrieved, budget in ((RETRIEVED * 20, 20), (long_titles * 5, 25), (long_titles, 5)):
+        evidence, stats = pack_evidence("Central bank cuts interest rates", retrieved, token_budget=budget)
+        assert count_tokens(evidence) <= budget
+        assert stats["evidence_tokens"] == (count_tokens(evidence) if evidence else 0)
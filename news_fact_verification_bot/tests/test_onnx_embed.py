@@ -0,0 +1,42 @@
+import pytest
+from bot.onnx_embed import _pooling_config
+
+class Transformer:
+    do_lower_case = True
+
+class Pooling:
+    def __init__(self, cfg):
+        self.cfg = cfg
+
+    def get_config_dict(self):
+        return self.cfg
+
+class Normalize:
+    pass
+
+class Dense:
+    pass
+
+def test_pooling_config_supported_pipelines():
+    assert _pooling_config([Transformer(), Pooling({"pooling_mode": "cls"}), Normalize()]) == \
+        {"mode": "cls", "normalize": True, "do_lower_case": True}
+    # pre-v5 boolean flags
+    assert _pooling_config([Transformer(), Pooling({"pooling_mode_max_tokens": True})])["mode"] == "max"
+
+@pytest.mark.parametrize("modules", [
+    [Transformer(), Pooling({"pooling_mode": "lasttoken"})],
+    [Transformer(), Pooling({"pooling_mode_weightedmean_tokens": True})],
+    [Transformer(), Pooling({"pooling_mode": ["mean", "max"]})],
+    [Transformer(), Pooling({"pooling_mode": "mean"}), Dense(), Normalize()],
+])
+def test_pooling_config_rejects_what_onnx_cannot_reproduce(modules):
+    with pytest.raises(ValueError):
+        _pooling_config(modules)
+
+def test_embed_cache_named_after_loaded_model_file():
+    from types import SimpleNamespace
+    from bot.embed import EMBED_CACHE_FILE, cache_file
+    assert cache_file(SimpleNamespace(model_file="model.int8.onnx")).name == "embed_cache.onnx-int8.orjson"
+    # fp32 fallback when no int8 copy was exported
+    assert cache_file(SimpleNamespace(model_file="model.onnx")).name == "embed_cache.onnx.orjson"
+    assert cache_file(object()) == EMBED_CACHE_FILE  # torch SentenceTransformer
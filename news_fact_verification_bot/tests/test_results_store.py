@@ -0,0 +1,45 @@
+import json
+import pytest
+pa = pytest.importorskip("pyarrow")
+from bot.evaluation import evaluate
+from bot.results_store import ParquetResultsWriter, read_texts
+
+def _records():
+    chunks = [{"id": f"c{i}", "text": t, "title": f"t{i}"} for i, t in enumerate([
+        "The central bank cut interest rates by half a point.",
+        "Regulators approved the vaccine for young children.",
+        "Flooding closed roads in the northern provinces.",
+    ])]
+    claims = [("Central bank cut interest rates", "SUPPORTED", "SUPPORTED", [0, 2]),
+              ("Vaccine approved for children", "UNSUPPORTED", "SUPPORTED", [1, 0]),
+              ("Roads closed by flooding", "UNSUPPORTED", "UNSUPPORTED", [2])]
+    for claim, verdict, gold, ids in claims:
+        obj = {"claim": claim, "verdict": verdict, "confidence": 0.7, "rationale": "r", "cited_sources": [],
+               "retrieval_stats": {"k": 2, "filtered": 0, "latency_s": 0.1 * len(ids)}, "gold_label": gold}
+        yield obj, [chunks[i] for i in ids]
+
+def test_parquet_results_match_jsonl_report(tmp_path):
+    gold = tmp_path / "gold.jsonl"
+    jsonl, parquet = tmp_path / "run.jsonl", tmp_path / "run.parquet"
+    with jsonl.open("w") as wf, ParquetResultsWriter(parquet, store_texts=True) as pw:
+        for obj, retrieved in _records():
+            wf.write(json.dumps({**obj, "retrieved": retrieved}) + "\n")
+            pw.write(obj, retrieved)
+    gold.write_text("".join(json.dumps({"claim": o["claim"], "label": o["gold_label"]}) + "\n" for o, _ in _records()))
+    assert read_texts(parquet).num_rows == 3  # c0 retrieved twice, stored once
+    r_jsonl = evaluate(jsonl, gold, tmp_path / "a.json", extended=True)
+    r_parquet = evaluate(parquet, gold, tmp_path / "b.json", extended=True)
+    assert r_parquet["accuracy"] == r_jsonl["accuracy"]
+    assert r_parquet["confusion"] == r_jsonl["confusion"]
+    assert r_parquet["per_label"] == r_jsonl["per_label"]
+    for key, val in r_jsonl["extended"].items():
+        assert r_parquet["extended"][key] == pytest.approx(val)
+
+def test_evaluate_detects_parquet_regardless_of_suffix(tmp_path):
+    gold = tmp_path / "gold.jsonl"
+    gold.write_text("".join(json.dumps({"claim": o["claim"], "label": o["gold_label"]}) + "\n" for o, _ in _records()))
+    misnamed = tmp_path / "run.jsonl"  # as written by `--out-format parquet --out run.jsonl`
+    with ParquetResultsWriter(misnamed) as pw:
+        for obj, retrieved in _records():
+            pw.write(obj, retrieved)
+    assert evaluate(misnamed, gold, tmp_path / "r.json")["accuracy"] == pytest.approx(2 / 3)
@@ -0,0 +1,63 @@
+from datetime import date
+import numpy as np
+import pytest
+from bot.shards import ShardedIndex, shard_key, shard_range, shards_for_window
+
+def test_shard_keys_and_window():
+    assert shard_key("2025-07-10") == "2025-W28"
+    assert shard_key("2025-07-10", "month") == "2025-07"
+    assert shard_key(None) == "undated"
+    assert shard_range("2025-W28") == (date(2025, 7, 7), date(2025, 7, 13))
+    keys = ["2025-06", "2025-W27", "2025-W28", "undated"]
+    assert shards_for_window(keys, date(2025, 7, 8)) == ["2025-W28", "undated"]
+
+def test_sharded_numpy_query_retain_compact(tmp_path):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(40, 8)).astype(np.float32)
+    days = ["2025-06-02", "2025-06-10", "2025-07-08", None]
+    metas = [{"source": "s", **({"published_at": days[i % 4]} if days[i % 4] else {})} for i in range(40)]
+    idx = ShardedIndex("numpy", period="week", index_dir=str(tmp_path))
+    idx.add([f"d{i}" for i in range(40)], [f"t{i}" for i in range(40)], metas, x.tolist())
+    idx.persist()
+    assert idx.shard_keys() == ["2025-W23", "2025-W24", "2025-W28", "undated"]
+    res = idx.query(embedding=x[2], n=3, since="2025-07-01")
+    assert res["ids"][0][0] == "d2"
+    assert all(int(i[1:]) % 4 in (2, 3) for i in res["ids"][0])
+    plan = idx.compact(older_than_days=14, today=date(2025, 7, 10))
+    assert plan == {"2025-06": ["2025-W23", "2025-W24"]}
+    assert idx.shard_keys() == ["2025-06", "2025-W28", "undated"]
+    assert idx.count() == 40
+    assert idx.retain(keep_days=5, today=date(2025, 7, 10)) == ["2025-06"]
+    assert idx.count() == 20
+
+def test_compact_splits_week_straddling_two_months(tmp_path):
+    # 2025-W22 runs Mon 2025-05-26 .. Sun 2025-06-01
+    x = np.eye(4, dtype=np.float32)
+    metas = [{"source": "s", "published_at": d} for d in ("2025-05-27", "2025-06-01")]
+    idx = ShardedIndex("numpy", period="week", index_dir=str(tmp_path))
+    idx.add(["may", "june"], ["t0", "t1"], metas, x[:2].tolist())
+    idx.persist()
+    assert idx.compact(older_than_days=7, today=date(2025, 6, 20)) == {"2025-05": ["2025-W22"], "2025-06": ["2025-W22"]}
+    assert idx.shard_keys() == ["2025-05", "2025-06"]
+    assert idx.query(embedding=x[1], n=2, since="2025-06-01")["ids"][0] == ["june"]
+    assert idx.retain(keep_days=19, today=date(2025, 6, 20)) == ["2025-05"]
+    assert idx.get_all()[0] == ["june"]
+
+def test_sharded_chroma_text_query_retain_compact(tmp_path):
+    pytest.importorskip("chromadb")
+    x = np.eye(8, dtype=np.float32)
+    days = ["2025-06-02", "2025-06-10", "2025-07-08", None]
+    metas = [{"source": "s", **({"published_at": days[i % 4]} if days[i % 4] else {})} for i in range(8)]
+    docs = [f"topic{i}" for i in range(8)]
+    idx = ShardedIndex("chroma", period="week", persist_dir=str(tmp_path), encoder=lambda t: x[docs.index(t)])
+    idx.add([f"d{i}" for i in range(8)], docs, metas, x.tolist())
+    assert idx.shard_keys() == ["2025-W23", "2025-W24", "2025-W28", "undated"]
+    res = idx.query("topic2", n=3, since="2025-07-01")
+    assert res["ids"][0][0] == "d2"
+    assert all(int(i[1:]) % 4 in (2, 3) for i in res["ids"][0])
+    assert idx.compact(older_than_days=14, today=date(2025, 7, 10)) == {"2025-06": ["2025-W23", "2025-W24"]}
+    assert idx.shard_keys() == ["2025-06", "2025-W28", "undated"]
+    assert idx.count() == 8
+    assert idx.query("topic1", n=1)["ids"][0] == ["d1"]
+    assert idx.retain(keep_days=5, today=date(2025, 7, 10)) == ["2025-06"]
+    assert idx.count() == 4
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from bot.bm25_baseline import BM25Baseline
+from bot.snapshot import Snapshot, open_numpy_backend, write_snapshot
+
+DOCS = [
+    "The central bank cut interest rates by 50 basis points.",
+    "Heavy rain caused flooding in the northern provinces.",
+    "Regulators approved the vaccine for children under five.",
+    "The central bank kept rates unchanged amid inflation worries.",
+]
+
+def test_snapshot_roundtrip_bm25_and_vectors(tmp_path):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(len(DOCS), 8)).astype(np.float32)
+    metas = [{"title": f"t{i}", "source": "S", "published_at": "2025-07-0%d" % (i + 1)} for i in range(len(DOCS))]
+    path = tmp_path / "index.nfsnap"
+    write_snapshot(path, [f"c{i}" for i in range(len(DOCS))], DOCS, metas, x, dtype="int8")
+    snap = Snapshot(path, verify=True)
+    assert snap.manifest["count"] == 4 and snap.ids[2] == "c2" and snap.metadatas[1]["title"] == "t1"
+
+    live = BM25Baseline.from_records(DOCS, metas)
+    served = BM25Baseline.from_snapshot(snap)
+    tokens = live._tokenize("central bank rates")
+    assert np.allclose(live.bm25.get_scores(tokens), served.bm25.get_scores(tokens))
+    assert [i["title"] for i in served.query("central bank rates", k=2)] == [i["title"] for i in live.query("central bank rates", k=2)]
+
+    be = open_numpy_backend(snap)
+    assert be.query(embedding=x[3], n=1)["ids"][0] == ["c3"]
+    assert be.query(embedding=x[3], n=4, since="2025-07-03")["ids"][0][0] == "c3"
+    with pytest.raises(ValueError, match="read-only"):
+        be.add(ids=["c9"], documents=["new"], metadatas=[{}], embeddings=[x[0].tolist()])
+    with pytest.raises(ValueError, match="read-only"):
+        be.persist()
+
+def test_snapshot_rejects_empty_index(tmp_path):
+    with pytest.raises(ValueError, match="empty index"):
+        write_snapshot(tmp_path / "empty.nfsnap", [], [], [], [])
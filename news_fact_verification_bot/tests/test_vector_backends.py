@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from bot.vector_backends import NumpyBackend
+
+def _build(tmp_path, dtype, nlist=0):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(200, 16)).astype(np.float32)
+    be = NumpyBackend(index_dir=str(tmp_path / dtype), dtype=dtype, nlist=nlist, nprobe=4)
+    metas = [{"source": "A" if i % 2 else "B", "published_at": "2025-07-01" if i < 100 else "2025-08-01"} for i in range(200)]
+    be.add(ids=[f"d{i}" for i in range(200)], documents=[f"doc {i}" for i in range(200)], metadatas=metas, embeddings=x.tolist())
+    be.persist()
+    return be, x
+
+def test_numpy_backend_exact_and_filters(tmp_path):
+    for dtype in ("int8", "float16"):
+        be, x = _build(tmp_path, dtype)
+        res = be.query(embedding=x[42], n=3)
+        assert res["ids"][0][0] == "d42"
+        assert len(res["documents"][0]) == 3
+        res = be.query(embedding=x[42], n=5, since="2025-07-15", sources=["B"])
+        assert res["ids"][0] and all(int(i[1:]) >= 100 and int(i[1:]) % 2 == 0 for i in res["ids"][0])
+        # reopening memory-maps the persisted files
+        assert NumpyBackend(index_dir=str(be.index_dir)).count() == 200
+
+def test_numpy_backend_ivf(tmp_path):
+    be, x = _build(tmp_path, "int8", nlist=8)
+    assert be.centroids is not None
+    assert be.query(embedding=x[7], n=1)["ids"][0] == ["d7"]
+
+def test_numpy_backend_persist_twice_upserts(tmp_path):
+    be, x = _build(tmp_path, "int8")
+    be.add(ids=["d3", "d500"], documents=["doc 3 v2", "doc 500"], metadatas=[{}, {}], embeddings=[x[3].tolist(), x[9].tolist()])
+    be.persist()
+    assert be.count() == 201
+    again = NumpyBackend(index_dir=str(be.index_dir))
+    assert again.count() == 201
+    res = again.query(embedding=x[3], n=4)["ids"][0]
+    assert res.count("d3") == 1
+    assert again.documents[again.ids.index("d3")] == "doc 3 v2"
+
+def test_chroma_backend_queries_text_through_ndarray_encoder():
+    chromadb = pytest.importorskip("chromadb")
+    from bot.retrieval import Retriever
+    from bot.vector_backends import ChromaBackend
+    x = np.eye(4, dtype=np.float32)
+    vocab = ["central bank", "flooding", "vaccine", "election"]
+    be = ChromaBackend(client=chromadb.EphemeralClient(), collection="test_ndarray_encoder",
+                       encoder=lambda text: x[vocab.index(text)])
+    be.add(ids=[f"d{i}" for i in range(4)], documents=vocab, metadatas=[{"title": v, "source": "S"} for v in vocab], embeddings=x.tolist())
+    items, _ = Retriever(backend=be).query("central bank", k=1, days=None)
+    assert [i["id"] for i in items] == ["d0"]